@@ -0,0 +1,44 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import batch  # noqa: E402
+
+PARTICLES_PATH = os.path.join(os.path.dirname(__file__), "..", "src", "tests", "particles")
+
+
+def bench(workers: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        out = tempfile.mkdtemp()
+        try:
+            start = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                batch.convert([PARTICLES_PATH], out, workers=workers)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            shutil.rmtree(out)
+    return best
+
+
+def main(repeat: int = 3) -> None:
+    count = len(list(batch.iter_jobs([PARTICLES_PATH], "")))
+    cpus = os.cpu_count() or 1
+    base = bench(1, repeat)
+    print(f"{count} files, {cpus} CPUs")
+    for workers in sorted({1, 2, 4, cpus}):
+        elapsed = base if workers == 1 else bench(workers, repeat)
+        print(
+            f"--jobs {workers:<3} {elapsed:.3f}s {count / elapsed:.1f} files/s "
+            f"{base / elapsed:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
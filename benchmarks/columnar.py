@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import columnar  # noqa: E402
+
+PARTICLES_PATH = os.path.join(os.path.dirname(__file__), "..", "src", "tests", "particles")
+
+
+def bench(run: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat: int = 5) -> None:
+    columnar.require_numpy()
+    start = time.perf_counter()
+    corpus = columnar.load([PARTICLES_PATH])
+    load = time.perf_counter() - start
+    emitters = corpus.emitters
+
+    def query_loop() -> int:
+        return sum(
+            1
+            for document in corpus.documents
+            for e in document["emitters"]
+            if e["emit_rate"]["primary_emit_rate"][0] * e["particle"]["max_duration"][0] > 2000
+        )
+
+    def query_columns() -> int:
+        rate = emitters["emit_rate.primary_emit_rate"][:, 0]
+        return int((rate * emitters["particle.max_duration"][:, 0] > 2000).sum())
+
+    def scale_loop() -> None:
+        for document in corpus.documents:
+            for e in document["emitters"]:
+                if e["type"] == "ring":
+                    e["radius_x"] = [x * 1.0 for x in e["radius_x"]]
+
+    def scale_columns() -> None:
+        emitters["radius_x"][emitters["type"] == "ring"] *= 1.0
+
+    assert query_loop() == query_columns()
+
+    print(
+        f"{len(corpus.files)} files, {len(emitters)} emitters, {len(list(emitters.keys()))} columns"
+    )
+    print(f"load      {load * 1000:8.1f} ms")
+    for label, loop, columns in (
+        ("query", query_loop, query_columns),
+        ("scale", scale_loop, scale_columns),
+    ):
+        a, b = bench(loop, repeat), bench(columns, repeat)
+        print(f"{label:<9} {a * 1000:8.3f} ms loop {b * 1000:8.3f} ms columns {a / b:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import daemon  # noqa: E402
+
+PARTICLES_PATH = os.path.join(os.path.dirname(__file__), "..", "src", "tests", "particles")
+CONVERTER = os.path.join(os.path.dirname(__file__), "..", "particle_converter.py")
+
+
+def invoke(args: List[str], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, CONVERTER, "--no-pause", "--no-cache", *args],
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def wait_for_daemon(timeout: float = 10) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        state = daemon._read_state()
+        if state is not None:
+            return state
+        time.sleep(0.05)
+    raise RuntimeError("the resident converter did not start")
+
+
+def report(label: str, timings: List[float]) -> None:
+    ordered = sorted(timings)
+    print(
+        f"{label:<6} median {statistics.median(ordered) * 1000:6.1f} ms "
+        f"p90 {ordered[int(len(ordered) * 0.9) - 1] * 1000:6.1f} ms"
+    )
+
+
+def main(repeat: int = 20) -> None:
+    path = os.path.join(PARTICLES_PATH, "Ability_AntiModuleTorpedoesImpact.particle")
+    with tempfile.TemporaryDirectory() as out:
+        args = ["--out", out, path]
+        cold = invoke(["--no-daemon", *args], repeat)
+
+        subprocess.Popen(
+            [sys.executable, CONVERTER, "--daemon", "--idle-timeout", "60"],
+            stdout=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        state = wait_for_daemon()
+        try:
+            warm = invoke(args, repeat)
+        finally:
+            os.kill(state["pid"], signal.SIGTERM)
+
+    report("cold", cold)
+    report("warm", warm)
+    print(f"{statistics.median(cold) / statistics.median(warm):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import gc
+import io
+import os
+import sys
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Any, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.converter import SinsParticle  # noqa: E402
+
+PARTICLES_PATH = os.path.join(os.path.dirname(__file__), "..", "src", "tests", "particles")
+
+
+def load(paths: List[str]) -> List[Any]:
+    models = []
+    with redirect_stdout(io.StringIO()):
+        for path in paths:
+            particle = SinsParticle(path).parse()
+            models.append((particle.nodes, particle.emitters, particle.modifiers))
+    return models
+
+
+def main() -> None:
+    paths = [
+        os.path.join(PARTICLES_PATH, f)
+        for f in sorted(os.listdir(PARTICLES_PATH))
+        if f.endswith(".particle")
+    ]
+    load(paths[:1])
+
+    gc.collect()
+    tracemalloc.start()
+    models = load(paths)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    emitters = sum(len(e) for _, e, _ in models)
+    modifiers = sum(len(m) for _, _, m in models)
+    print(f"{len(models)} effects, {emitters} emitters, {modifiers} modifiers")
+    print(f"retained {current / 1024 / 1024:.2f} MB, peak {peak / 1024 / 1024:.2f} MB")
+    print(f"{current / max(1, emitters + modifiers):.0f} bytes per emitter/modifier")
+
+
+if __name__ == "__main__":
+    main()
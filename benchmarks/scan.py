@@ -0,0 +1,48 @@
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.converter import SinsParticle  # noqa: E402
+
+PARTICLES_PATH = os.path.join(os.path.dirname(__file__), "..", "src", "tests", "particles")
+
+
+def bench(paths: List[str], run: Callable[[SinsParticle], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            for path in paths:
+                run(SinsParticle(path))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat: int = 3) -> None:
+    paths = [
+        os.path.join(PARTICLES_PATH, f)
+        for f in sorted(os.listdir(PARTICLES_PATH))
+        if f.endswith(".particle")
+    ]
+
+    with_emitters = [p for p in paths if SinsParticle(p).scan().index.emitters]  # type: ignore
+
+    full = bench(with_emitters, lambda p: p.parse(), repeat)
+    scan = bench(with_emitters, lambda p: p.scan(), repeat)
+    first = bench(with_emitters, lambda p: p.scan().emitter(0), repeat)
+
+    print(f"{len(with_emitters)} files")
+    for label, elapsed in (("parse", full), ("scan", scan), ("scan+emitter(0)", first)):
+        print(
+            f"{label:>16}: {elapsed * 1000:8.1f} ms {len(with_emitters) / elapsed:9.1f} files/s"
+            f" ({elapsed / full:.1%} of parse)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from dataclasses import is_dataclass
+from enum import Enum
+from typing import Any, Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import classes as c  # noqa: E402
+from src.converter import SinsParticle  # noqa: E402
+
+PARTICLES_PATH = os.path.join(os.path.dirname(__file__), "..", "src", "tests", "particles")
+
+
+def generic(obj: Any) -> Any:
+    if hasattr(obj, "__serialize__"):
+        return obj.__serialize__()
+    elif isinstance(obj, Enum):
+        return obj.name.lower()
+    elif isinstance(obj, list):
+        return [generic(i) for i in obj]
+    elif isinstance(obj, dict):
+        return {k: generic(v) for k, v in obj.items()}
+    elif is_dataclass(obj):
+        result = {}
+        for field in obj.__dataclass_fields__.values():
+            value = getattr(obj, field.name)
+            if value is not None:
+                result[field.name] = generic(value)
+        return result
+    else:
+        return obj
+
+
+def load() -> List[c.ParticleEffect]:
+    effects = []
+    with redirect_stdout(io.StringIO()):
+        for f in sorted(os.listdir(PARTICLES_PATH)):
+            if not f.endswith(".particle"):
+                continue
+            particle = SinsParticle(os.path.join(PARTICLES_PATH, f)).parse()
+            if particle.file:
+                effects.append(
+                    c.ParticleEffect(
+                        nodes=particle.nodes,
+                        emitters=particle.emitters,
+                        modifiers=particle.modifiers,
+                        emitter_to_node_attachments=particle.emitter_to_node_attachments,
+                        modifier_to_emitter_attachments=particle.modifier_to_emitter_attachments,
+                    )
+                )
+    return effects
+
+
+def bench(effects: List[c.ParticleEffect], run: Callable[[Any], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for effect in effects:
+            run(effect)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat: int = 5) -> None:
+    effects = load()
+    assert all(generic(e) == c.serialize(e) for e in effects)
+
+    before = bench(effects, generic, repeat)
+    after = bench(effects, c.serialize, repeat)
+
+    print(f"{len(effects)} effects")
+    print(f"generic   {before * 1000:.1f} ms")
+    print(f"compiled  {after * 1000:.1f} ms {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
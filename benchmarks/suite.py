@@ -0,0 +1,246 @@
+import argparse
+import gc
+import io
+import json
+import math
+import os
+import platform
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Any, Dict, List, Optional, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import __version__  # noqa: E402
+from src.converter import SinsParticle  # noqa: E402
+from src.index import scan_particle  # noqa: E402
+from src.writer import write_json  # noqa: E402
+
+PARTICLES_PATH = os.path.join(os.path.dirname(__file__), "..", "src", "tests", "particles")
+TEMPLATE = os.path.join(PARTICLES_PATH, "Ability_AntiModuleTorpedoesImpact.particle")
+
+PHASES = ("parse", "build", "serialize", "write")
+SCALES = (10, 100, 1000)
+
+# metrics where a larger value is a regression, the rest regress when they shrink
+LOWER_IS_BETTER = ("p50_ms", "p99_ms", "peak_kib", *(f"{phase}_ms" for phase in PHASES))
+HIGHER_IS_BETTER = ("files_per_sec",)
+# timing changes below this are scheduler noise on small inputs
+NOISE_MS = 1.0
+
+
+def convert(path: str) -> List[float]:
+    with open(path, "rb") as f:
+        data = f.read()
+
+    particle = SinsParticle(path)
+    start = time.perf_counter()
+    particle._collect(data)
+    parsed = time.perf_counter()
+    effect = particle._build_particle_effect()
+    built = time.perf_counter()
+    document = particle.__serialize__(effect)
+    serialized = time.perf_counter()
+    write_json(document, io.StringIO())
+    written = time.perf_counter()
+
+    return [parsed - start, built - parsed, serialized - built, written - serialized]
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def peak_memory(paths: List[str]) -> int:
+    peak = 0
+    gc.collect()
+    tracemalloc.start()
+    for path in paths:
+        tracemalloc.reset_peak()
+        convert(path)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+    return peak
+
+
+def measure(paths: List[str], repeat: int) -> Dict[str, Any]:
+    best: Dict[str, List[float]] = {}
+    phases_best: Dict[str, List[float]] = {}
+    failed = set()
+
+    with redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            for path in paths:
+                if path in failed:
+                    continue
+                try:
+                    phases = convert(path)
+                except Exception:
+                    failed.add(path)
+                    continue
+                previous = best.get(path)
+                if previous is None or sum(phases) < sum(previous):
+                    best[path] = phases
+                phases_best[path] = [min(p) for p in zip(phases, phases_best.get(path, phases))]
+
+        peak = peak_memory([path for path in paths if path not in failed])
+
+    latencies = [sum(phases) for phases in best.values()]
+    total = sum(latencies)
+    result: Dict[str, Any] = {
+        "files": len(best),
+        "failed": len(failed),
+        "files_per_sec": len(best) / total if total else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000 if latencies else 0.0,
+        "p99_ms": percentile(latencies, 99) * 1000 if latencies else 0.0,
+        "peak_kib": peak / 1024,
+    }
+    for i, phase in enumerate(PHASES):
+        result[f"{phase}_ms"] = sum(phases[i] for phases in phases_best.values()) * 1000
+    return result
+
+
+def synthesize(template: str, emitters: int) -> bytes:
+    index = scan_particle(template)
+    with open(template, "rb") as f:
+        data = f.read()
+
+    def block(entries: List[Any], i: int, name: str) -> bytes:
+        entry = entries[i % len(entries)]
+        text = data[entry.offset : entry.end]
+        return re.sub(rb'(\n\t\tName )"[^"]*"', rb'\1"' + name.encode() + b'"', text, count=1)
+
+    parts = [
+        re.sub(
+            rb"NumEmitters \d+",
+            b"NumEmitters %d" % emitters,
+            data[: index.emitters[0].offset],
+        )
+    ]
+    for i in range(emitters):
+        parts.append(block(index.emitters, i, f"emitter-{i}"))
+
+    parts.append(
+        re.sub(
+            rb"NumAffectors \d+",
+            b"NumAffectors %d" % emitters,
+            data[index.emitters[-1].end : index.affectors[0].offset],
+        )
+    )
+    for i in range(emitters):
+        affector = block(index.affectors, i, f"affector-{i}")
+        parts.append(
+            re.sub(
+                rb'attachedEmitterName "[^"]*"', b'attachedEmitterName "emitter-%d"' % i, affector
+            )
+        )
+
+    parts.append(data[index.affectors[-1].end :])
+    return b"".join(parts)
+
+
+def run(repeat: int, scales: Sequence[int]) -> Dict[str, Any]:
+    paths = [
+        os.path.join(PARTICLES_PATH, f)
+        for f in sorted(os.listdir(PARTICLES_PATH))
+        if f.endswith(".particle")
+    ]
+    results = {"corpus": measure(paths, repeat)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            path = os.path.join(tmp, f"synthetic-{scale}.particle")
+            with open(path, "wb") as f:
+                f.write(synthesize(TEMPLATE, scale))
+            results[f"synthetic-{scale}"] = measure([path], repeat)
+
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    regressions = []
+    for name, metrics in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            old, new = previous.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            if metric.endswith("_ms") and abs(new - old) < NOISE_MS:
+                continue
+            change = (new - old) / old * 100
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            if change > threshold:
+                regressions.append(f"{name} {metric}: {old:.2f} → {new:.2f} ({change:+.1f}%)")
+    return regressions
+
+
+def report(current: Dict[str, Any]) -> None:
+    header = ["", "files", "files/s", "p50 ms", "p99 ms", "peak KiB"]
+    header += [f"{phase} ms" for phase in PHASES]
+    print(" ".join(f"{h:>14}" for h in header))
+    for name, m in current["results"].items():
+        row = [name, m["files"], f"{m['files_per_sec']:.1f}", f"{m['p50_ms']:.2f}"]
+        row += [f"{m['p99_ms']:.2f}", f"{m['peak_kib']:.0f}"]
+        row += [f"{m[f'{phase}_ms']:.1f}" for phase in PHASES]
+        print(" ".join(f"{str(v):>14}" for v in row))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark particle conversion by phase")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per file, best is kept")
+    parser.add_argument(
+        "--scales",
+        type=lambda s: [int(v) for v in s.split(",") if v],
+        default=list(SCALES),
+        help="emitter counts of the synthetic inputs, comma separated",
+    )
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument(
+        "--threshold", type=float, default=20.0, help="allowed regression in percent"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    current = run(args.repeat, args.scales)
+    report(current)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Saved results to {args.save}")
+
+    if args.baseline:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}, skipping comparison")
+            return 0
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        for regression in regressions:
+            print(f"Regression {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions over {args.threshold:g}% against {args.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
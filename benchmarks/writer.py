@@ -0,0 +1,55 @@
+import io
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from typing import Any, Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.converter import SinsParticle  # noqa: E402
+from src.writer import write_json  # noqa: E402
+
+PARTICLES_PATH = os.path.join(os.path.dirname(__file__), "..", "src", "tests", "particles")
+
+
+def bench(documents: List[Any], write: Callable[[Any, io.StringIO], Any], repeat: int) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        outputs = []
+        start = time.perf_counter()
+        for document in documents:
+            buf = io.StringIO()
+            write(document, buf)
+            outputs.append(buf.getvalue())
+        best = min(best, time.perf_counter() - start)
+    return best, outputs
+
+
+def main(repeat: int = 5) -> None:
+    documents = []
+    with redirect_stdout(io.StringIO()):
+        for f in sorted(os.listdir(PARTICLES_PATH)):
+            particle = SinsParticle(os.path.join(PARTICLES_PATH, f)).parse()
+            if particle.file:
+                documents.append(particle.file)
+
+    baseline, expected = bench(documents, lambda d, f: f.write(json.dumps(d, indent=2)), repeat)
+    print(f"{len(documents)} documents")
+    print(f"json.dumps  {baseline * 1000:7.1f} ms {sum(map(len, expected)) / 1024:8.0f} KiB")
+
+    for label, indent in (("pretty", 2), ("compact", None)):
+        elapsed, outputs = bench(documents, lambda d, f: write_json(d, f, indent), repeat)
+        _, again = bench(documents, lambda d, f: write_json(d, f, indent), 1)
+        assert outputs == again, "output is not deterministic"
+        if indent is not None:
+            assert outputs == expected, "pretty output differs from json.dumps"
+        print(
+            f"{label:<11} {elapsed * 1000:7.1f} ms {sum(map(len, outputs)) / 1024:8.0f} KiB "
+            f"{baseline / elapsed:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 # -*- mode: python ; coding: utf-8 -*-
+import sys
 
-__version__ = "1.4.0"
+sys.path.insert(0, SPECPATH)
+
+from src import __version__
 
 a = Analysis(
     ["particle_converter.py"],
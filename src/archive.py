@@ -0,0 +1,60 @@
+import os
+import zipfile
+from typing import Dict, Iterator, Tuple
+
+ARCHIVE_EXTENSIONS = (".zip",)
+MAX_OPEN = 8
+
+
+def is_archive(path: str) -> bool:
+    return path.lower().endswith(ARCHIVE_EXTENSIONS) and os.path.isfile(path)
+
+
+def iter_members(path: str, extensions: Tuple[str, ...]) -> Iterator[str]:
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if not info.is_dir() and info.filename.endswith(extensions):
+                yield info.filename
+
+
+def member_dir(member: str) -> str:
+    # members are mirrored under the output folders, so never let one climb out of them
+    parts = member.replace("\\", "/").split("/")[:-1]
+    return os.path.join("", *(part for part in parts if part not in ("", ".", "..")))
+
+
+_archives: Dict[Tuple[str, int, int], zipfile.ZipFile] = {}
+
+
+def _archive(path: str) -> zipfile.ZipFile:
+    # workers read many members of the same archive, so keep its central directory parsed
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    archive = _archives.get(key)
+    if archive is None:
+        if len(_archives) >= MAX_OPEN:
+            _archives.pop(next(iter(_archives))).close()
+        archive = _archives[key] = zipfile.ZipFile(key[0])
+    return archive
+
+
+def close() -> None:
+    # an open zip cannot be deleted or replaced on Windows, so handles only live for one run
+    while _archives:
+        _archives.popitem()[1].close()
+
+
+def read_member(path: str, member: str) -> bytes:
+    return _archive(path).read(member)
+
+
+def has_member(path: str, member: str) -> bool:
+    try:
+        return member in _archive(path).NameToInfo
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+
+def member_signature(path: str, member: str) -> Tuple[int, int]:
+    info = _archive(path).getinfo(member)
+    return info.CRC, info.file_size
@@ -0,0 +1,319 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from colorama import Fore
+
+from src import archive, profiling
+from src.bundle import Bundle
+from src.cache import ConversionCache
+from src.converter import Logger, convert_output, output_target
+from src.dedup import DedupStore
+from src.deps import DependencyIndex, References, references, signature
+from src.fileutil import write_if_changed
+from src.profiling import FileProfile, Profiler, Report
+
+EXTENSIONS = (".particle", ".texanim")
+
+
+@dataclass
+class Job:
+    source: str
+    target: str
+    compact: bool = False
+    member: Optional[str] = None
+    bundle: bool = False
+
+    @property
+    def path(self) -> str:
+        return f"{self.source}/{self.member}" if self.member else self.source
+
+
+@dataclass
+class Result:
+    job: Job
+    status: str
+    log: str = ""
+    profile: Optional[FileProfile] = None
+    output: Optional[bytes] = None
+    written: bool = False
+    references: Optional[References] = None
+
+
+@dataclass
+class Summary:
+    converted: int = 0
+    cached: int = 0
+    written: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    failed: List[Result] = field(default_factory=list)
+    profiles: List[FileProfile] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+
+    def add(self, result: Result) -> None:
+        if result.profile:
+            self.profiles.append(result.profile)
+        if result.status == "failed":
+            self.failed.append(result)
+            return
+        self.outputs.append(result.job.target)
+        if result.written:
+            self.written += 1
+        elif not result.job.bundle:
+            self.unchanged += 1
+        if result.status == "cached":
+            self.cached += 1
+        else:
+            self.converted += 1
+
+
+def iter_jobs(paths: Iterable[str], out_path: str, compact: bool = False) -> Iterator[Job]:
+    for path in paths:
+        if archive.is_archive(path):
+            for member in archive.iter_members(path, EXTENSIONS):
+                yield from _job(path, archive.member_dir(member), out_path, compact, member)
+            continue
+        if not os.path.isdir(path):
+            yield from _job(path, "", out_path, compact)
+            continue
+
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            relative = os.path.relpath(root, path)
+            for file in sorted(files):
+                if file.endswith(EXTENSIONS):
+                    yield from _job(os.path.join(root, file), relative, out_path, compact)
+
+
+def _job(
+    file: str, relative: str, out_path: str, compact: bool, member: Optional[str] = None
+) -> Iterator[Job]:
+    file_name = os.path.basename(member or file)
+    name = f"{file_name.split('.')[0]}"
+
+    target = output_target(member or file, out_path)
+    if target is None:
+        Logger.info(f"Skipping: {name}", Fore.WHITE)
+        return
+    target_path, extension = target
+
+    save_path = os.path.normpath(os.path.join(target_path, relative, name + extension))
+    yield Job(file, save_path, compact, member)
+
+
+def _convert(job: Job, cache: Optional[ConversionCache]) -> Result:
+    try:
+        data = archive.read_member(job.source, job.member) if job.member else None
+        extension = os.path.splitext(job.target)[1]
+        status, output = convert_output(job.path, extension, cache, job.compact, data)
+        result = Result(job, status)
+        if output is None:
+            return result
+
+        if extension == ".particle_effect":
+            result.references = references(output)
+        if job.bundle:
+            result.output = output
+        else:
+            os.makedirs(os.path.dirname(job.target), exist_ok=True)
+            with profiling.span("save"):
+                result.written = write_if_changed(job.target, output)
+        return result
+    except Exception as e:
+        Logger.error(f"Failed to convert: {e}")
+        return Result(job, "failed")
+
+
+def run_job(
+    job: Job, cache: Optional[ConversionCache] = None, profiler: Optional[Profiler] = None
+) -> Result:
+    with io.StringIO() as buf, redirect_stdout(buf):
+        if profiler is None:
+            result = _convert(job, cache)
+        else:
+            with profiler.profile(job.path) as profile:
+                result = _convert(job, cache)
+            result.profile = profile
+        result.log = buf.getvalue()
+        return result
+
+
+def run(
+    jobs: List[Job],
+    cache: Optional[ConversionCache] = None,
+    workers: int = 1,
+    profiler: Optional[Profiler] = None,
+) -> Iterator[Result]:
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield run_job(job, cache, profiler)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(jobs) // (workers * 8))
+        yield from executor.map(
+            run_job, jobs, [cache] * len(jobs), [profiler] * len(jobs), chunksize=chunksize
+        )
+
+
+def convert(
+    paths: Iterable[str],
+    out_path: str,
+    cache: Optional[ConversionCache] = None,
+    workers: int = 1,
+    verbose: bool = True,
+    compact: bool = False,
+    profiler: Optional[Profiler] = None,
+    bundle: Optional[Bundle] = None,
+    index: Optional[DependencyIndex] = None,
+    incremental: bool = False,
+) -> Summary:
+    summary = Summary()
+    jobs = list(iter_jobs(paths, out_path, compact))
+    seen = {_key(job) for job in jobs}
+    listings: Dict[str, Dict[str, str]] = {}
+    if index:
+        # texture animations of effects that are up to date may still have changed
+        for job in list(jobs):
+            entry = index.entries.get(_key(job))
+            if entry:
+                jobs += _sidecars(job, entry.texture_animations, out_path, seen, listings)
+
+    try:
+        while jobs:
+            if bundle:
+                jobs = [replace(job, bundle=True) for job in jobs]
+            signatures = (
+                {_key(job): signature(job.source, job.member) for job in jobs} if index else {}
+            )
+            if index and incremental:
+                stale = _stale(jobs, index, signatures)
+                summary.skipped += len(jobs) - len(stale)
+                jobs = stale
+
+            sidecars: List[Job] = []
+            for result in run(jobs, cache, workers, profiler):
+                summary.add(result)
+                if bundle and result.output is not None:
+                    bundle.add(os.path.relpath(result.job.target, out_path), result.output)
+                if index:
+                    key = _key(result.job)
+                    if result.status == "failed":
+                        index.entries.pop(key, None)
+                    else:
+                        index.update(key, result.job.target, signatures[key], result.references)
+                    if result.references:
+                        animations = result.references.texture_animations
+                        sidecars += _sidecars(result.job, animations, out_path, seen, listings)
+                if verbose:
+                    Logger.print(
+                        f"{os.path.basename(result.job.path)} {Fore.GREEN }→{Fore.WHITE} "
+                        f"{os.path.relpath(result.job.target, out_path)}",
+                        Fore.WHITE,
+                    )
+                    if result.log:
+                        print(result.log, end="")
+            jobs = sidecars
+    finally:
+        archive.close()
+
+    return summary
+
+
+def _key(job: Job) -> str:
+    source = os.path.abspath(job.source)
+    return f"{source}/{job.member}" if job.member else source
+
+
+def _sidecars(
+    job: Job,
+    animations: List[str],
+    out_path: str,
+    seen: Set[str],
+    listings: Dict[str, Dict[str, str]],
+) -> Iterator[Job]:
+    # archives already list their .texanim members, loose effects pick up the ones next to them
+    if job.member or not animations:
+        return
+    directory = os.path.dirname(job.source)
+    files = listings.get(directory)
+    if files is None:
+        # listed once per run, a mod directory can hold thousands of effects
+        files = listings[directory] = {name.lower(): name for name in os.listdir(directory or ".")}
+    effects = os.path.join(out_path, "effects")
+    relative = os.path.relpath(os.path.dirname(job.target), effects)
+    for animation in animations:
+        name = files.get(os.path.splitext(animation)[0].lower() + ".texanim")
+        if name is None:
+            continue
+        for sidecar in _job(os.path.join(directory, name), relative, out_path, job.compact):
+            if _key(sidecar) not in seen:
+                seen.add(_key(sidecar))
+                yield sidecar
+
+
+def _stale(jobs: List[Job], index: DependencyIndex, signatures: Dict[str, List[int]]) -> List[Job]:
+    stale = {_key(job) for job in jobs if index.stale(_key(job), signatures[_key(job)], job.target)}
+    changed = {
+        os.path.basename(job.target).lower()
+        for job in jobs
+        if _key(job) in stale and job.target.endswith(".texture_animation")
+    }
+    for job in jobs:
+        entry = index.entries.get(_key(job))
+        if entry and changed.intersection(name.lower() for name in entry.texture_animations):
+            stale.add(_key(job))
+    return [job for job in jobs if _key(job) in stale]
+
+
+def report(summary: Summary) -> None:
+    Logger.info(
+        f"{summary.converted} converted, {summary.cached} cached, {summary.written} written, "
+        f"{summary.unchanged} unchanged, {len(summary.failed)} failed"
+        + (f", {summary.skipped} up to date" if summary.skipped else "")
+    )
+    for result in summary.failed:
+        Logger.error(result.job.path)
+        for line in result.log.splitlines():
+            if "[ERROR]" in line:
+                Logger.print(line.split("[ERROR]: ", 1)[-1], Fore.RED, tab=True)
+
+
+def report_profile(profile: Report, top: int = 10) -> None:
+    total = sum(phase.seconds for phase in profile.phases().values())
+    for name, phase in sorted(profile.phases().items(), key=lambda p: -p[1].seconds):
+        Logger.print(
+            f"{name:<10} {phase.seconds * 1000:9.1f} ms {phase.seconds / (total or 1):6.1%} "
+            f"peak {phase.peak_bytes / 1024:8.0f} KiB",
+            Fore.WHITE,
+            tab=True,
+        )
+    Logger.info(f"Slowest {min(top, len(profile.files))} of {len(profile.files)} files")
+    for file in profile.slowest(top):
+        Logger.print(f"{file.seconds * 1000:9.1f} ms {file.source}", Fore.WHITE, tab=True)
+
+
+def report_duplicates(store: DedupStore, out_path: str, top: int = 10) -> None:
+    Logger.info(
+        f"{sum(map(len, store.groups.values()))} outputs, {len(store.groups)} unique, "
+        f"{len(store.duplicates())} duplicated, {store.saved_bytes / 1024:.0f} KiB shared"
+    )
+    for digest in store.duplicates()[:top]:
+        targets = sorted(os.path.relpath(target, out_path) for target in store.groups[digest])
+        Logger.print(f"{len(targets)}x {store.sizes[digest] / 1024:.0f} KiB", Fore.WHITE, tab=True)
+        for target in targets:
+            Logger.print(target, Fore.WHITE, tab=True)
+
+
+def report_dangling(index: DependencyIndex, top: int = 10) -> None:
+    dangling = index.dangling()
+    if not dangling:
+        return
+    Logger.warn(f"Texture animations referenced but never converted: {len(dangling)}")
+    for name, targets in list(dangling.items())[:top]:
+        more = f" and {len(targets) - 1} more" if len(targets) > 1 else ""
+        Logger.print(f"{name} ← {targets[0]}{more}", Fore.YELLOW, tab=True)
@@ -0,0 +1,94 @@
+import gzip
+import io
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from typing import Any, Dict, List, Optional, Set, Union
+
+from src.fileutil import ChangedFile
+
+BUNDLE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+
+def is_bundle(path: str) -> bool:
+    return path.lower().endswith(BUNDLE_EXTENSIONS)
+
+
+def _epoch() -> int:
+    # reproducible builds pin the timestamp, otherwise use the earliest a zip can store
+    return max(int(os.environ.get("SOURCE_DATE_EPOCH", 315532800)), 315532800)
+
+
+class Bundle:
+    def __init__(self, path: str, level: Optional[int] = None) -> None:
+        if not is_bundle(path):
+            raise ValueError(f"unsupported bundle format: {path} ({', '.join(BUNDLE_EXTENSIONS)})")
+        self.path = path
+        self.level = level
+        self.entries: List[str] = []
+        self.names: Set[str] = set()
+        self.output = ChangedFile(path, "wb")
+        self.archive: Optional[Union[zipfile.ZipFile, tarfile.TarFile]] = None
+        self.stream: Optional[gzip.GzipFile] = None
+
+    def add(self, name: str, data: bytes) -> None:
+        # entries go out in job order as results arrive, so only the first of a name is kept
+        name = name.replace(os.sep, "/")
+        if name in self.names:
+            return
+        self.names.add(name)
+        self.entries.append(name)
+        archive = self.archive or self._open()
+        if isinstance(archive, zipfile.ZipFile):
+            self._add_zip(archive, name, data)
+        else:
+            self._add_tar(archive, name, data)
+
+    def close(self) -> bool:
+        (self.archive or self._open()).close()
+        if self.stream is not None:
+            self.stream.close()
+        # compared against the existing bundle as it was written, so an unchanged one is kept
+        self.output.__exit__(None, None, None)
+        return self.output.changed
+
+    def discard(self) -> None:
+        # called while handling an error, drops the partial archive and keeps the old bundle
+        if self.archive is not None:
+            self.archive = None
+            self.output.__exit__(*sys.exc_info())
+
+    def _open(self) -> Union[zipfile.ZipFile, tarfile.TarFile]:
+        f = self.output.__enter__()
+        path = self.path.lower()
+        if path.endswith(".zip"):
+            compression = zipfile.ZIP_STORED if self.level == 0 else zipfile.ZIP_DEFLATED
+            self.archive = zipfile.ZipFile(f, "w", compression, compresslevel=self.level)
+            return self.archive
+
+        level = 9 if self.level is None else self.level
+        if path.endswith((".tar.gz", ".tgz")):
+            # tarfile would stamp the gzip header with the current time and the file name
+            self.stream = gzip.GzipFile("", "wb", level, f, mtime=_epoch())
+        options: Dict[str, Any] = {"mode": "w"}
+        if path.endswith(".tar.bz2"):
+            options = {"mode": "w:bz2", "compresslevel": level or 1}
+        elif path.endswith(".tar.xz"):
+            options = {"mode": "w:xz", "preset": level}
+        self.archive = tarfile.open(fileobj=self.stream or f, format=tarfile.PAX_FORMAT, **options)
+        return self.archive
+
+    def _add_zip(self, z: zipfile.ZipFile, name: str, data: bytes) -> None:
+        info = zipfile.ZipInfo(name, time.gmtime(_epoch())[:6])
+        info.compress_type = z.compression
+        info.external_attr = 0o644 << 16
+        z.writestr(info, data, z.compression, self.level)
+
+    def _add_tar(self, tar: tarfile.TarFile, name: str, data: bytes) -> None:
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = _epoch()
+        info.mode = 0o644
+        tar.addfile(info, io.BytesIO(data))
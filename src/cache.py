@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.fileutil import atomic_write
+
+
+class ConversionCache:
+    def __init__(
+        self,
+        path: str,
+        version: str,
+        options: Optional[Dict[str, Any]] = None,
+        max_size: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ) -> None:
+        self.path = path
+        self.max_size = max_size
+        self.max_age = max_age
+        self.salt = json.dumps(
+            {"version": version, "options": options or {}}, sort_keys=True
+        ).encode("utf-8")
+
+    def key(self, data: bytes, extension: str) -> str:
+        h = hashlib.sha256(self.salt)
+        h.update(extension.encode("utf-8"))
+        h.update(b"\0")
+        h.update(data)
+        return h.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entry_path(key)
+        try:
+            with open(entry, "rb") as f:
+                output = f.read()
+            os.utime(entry)
+        except OSError:
+            return None
+        return output
+
+    def put(self, key: str, output: bytes) -> None:
+        entry = self._entry_path(key)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        atomic_write(entry, output)
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                entry = os.path.join(root, name)
+                try:
+                    stat = os.stat(entry)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry))
+        return sorted(entries)
+
+    def evict(self) -> int:
+        if self.max_size is None and self.max_age is None:
+            return 0
+
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        now = time.time()
+        evicted = 0
+
+        for mtime, size, entry in entries:
+            too_old = self.max_age is not None and now - mtime > self.max_age
+            too_big = self.max_size is not None and total > self.max_size
+            if not (too_old or too_big):
+                continue
+            try:
+                os.remove(entry)
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+
+        return evicted
@@ -1,6 +1,6 @@
 from enum import Enum, auto
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Union, Any
+from dataclasses import dataclass, field, fields, is_dataclass
+from typing import Callable, List, Dict, Optional, Tuple, Union, Any
 
 
 class ParticleFacing(Enum):
@@ -166,7 +166,7 @@ class FacingType(Enum):
         return cls(int(facing_type))
 
 
-@dataclass
+@dataclass(slots=True)
 class Attacher:
     attacher_id: int
     attachee_id: int
@@ -178,26 +178,72 @@ class Attacher:
         }
 
 
-@dataclass
+_INTERNED: Dict[Tuple[Any, ...], Any] = {}
+_MAX_INTERNED = 1 << 16
+
+
+@dataclass(frozen=True, slots=True, init=False)
 class Vector2f:
     min: float
     max: float
 
+    def __new__(cls, min: float, max: float) -> "Vector2f":
+        # 1, 1.0 and True are equal keys, so the types are part of it, and zeros are keyed by
+        # repr so that 0.0 and -0.0 stay distinct
+        if min and max:
+            key: Tuple[Any, ...] = (cls, type(min), type(max), min, max)
+        else:
+            key = (cls, repr(min), repr(max))
+        vector = _INTERNED.get(key)
+        if vector is None:
+            vector = object.__new__(cls)
+            object.__setattr__(vector, "min", min)
+            object.__setattr__(vector, "max", max)
+            # NaN never equals itself, so it would only take up a slot
+            if len(_INTERNED) < _MAX_INTERNED and min == min and max == max:
+                _INTERNED[key] = vector
+        return vector
+
+    def __reduce__(self) -> Any:
+        return type(self), (self.min, self.max)
+
+    @classmethod
+    def uniform(cls, value: float) -> "Vector2f":
+        return cls(value, value)
+
     def __serialize__(self) -> List[float]:
         return [float(self.min), float(self.max)]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, init=False)
 class Vector3f:
     x: float
     y: float
     z: float
 
+    def __new__(cls, x: float, y: float, z: float) -> "Vector3f":
+        if x and y and z:
+            key: Tuple[Any, ...] = (cls, type(x), type(y), type(z), x, y, z)
+        else:
+            key = (cls, repr(x), repr(y), repr(z))
+        vector = _INTERNED.get(key)
+        if vector is None:
+            vector = object.__new__(cls)
+            object.__setattr__(vector, "x", x)
+            object.__setattr__(vector, "y", y)
+            object.__setattr__(vector, "z", z)
+            if len(_INTERNED) < _MAX_INTERNED and x == x and y == y and z == z:
+                _INTERNED[key] = vector
+        return vector
+
+    def __reduce__(self) -> Any:
+        return type(self), (self.x, self.y, self.z)
+
     def __serialize__(self) -> List[float]:
         return [float(self.x), float(self.y), float(self.z)]
 
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     id: int
     name: str
@@ -209,7 +255,7 @@ class Node:
     roll: Vector2f
 
 
-@dataclass
+@dataclass(slots=True)
 class EmitRate:
     primary_emit_rate: Optional[Vector2f] = None
     primary_time: Optional[Vector2f] = None
@@ -218,14 +264,14 @@ class EmitRate:
     behavior: Optional[EmitRateBehavior] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Mesh:
     scale: Optional[Vector2f] = None
     mesh: Optional[str] = None
     shader: Optional[MeshShader] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Light:
     type: None
     color: None
@@ -234,7 +280,7 @@ class Light:
     surface_radius: None
 
 
-@dataclass
+@dataclass(slots=True)
 class BasicConstants:
     depth_fade_opacity: Optional[float] = None
     alpha_ramp_curvature: Optional[float] = None
@@ -245,7 +291,7 @@ class BasicConstants:
     alpha_ramp_growth_delay: float = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class UberConstants:
     basic_constants: BasicConstants
     refraction_constants: Optional[None] = None
@@ -254,7 +300,7 @@ class UberConstants:
     distortion_constants: Optional[None] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Billboard:
     uber_constants: UberConstants
     rotation: Vector2f = Vector2f(0, 0)
@@ -298,7 +344,7 @@ class Billboard:
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class Particle:
     billboard: Billboard
     mesh: Mesh
@@ -325,7 +371,7 @@ class Particle:
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class Emitter:
     id: int
     name: str
@@ -367,13 +413,13 @@ class Emitter:
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class ModifierForce:
     range: Optional[Vector2f] = None
     type: Optional[ForceType] = ForceType.CONSTANT
 
 
-@dataclass
+@dataclass(slots=True)
 class CoefficientGenerator:
     type: Optional[ForceType] = ForceType.CONSTANT
     range: Optional[Vector2f] = None
@@ -381,7 +427,7 @@ class CoefficientGenerator:
     easing_values: Optional[Vector2f] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Modifier:
     id: int
     name: str
@@ -415,7 +461,7 @@ class Modifier:
     tolerance: Optional[Vector2f] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ParticleEffect:
     version: Optional[int] = 2
     nodes: List[Node] = field(default_factory=list)
@@ -425,7 +471,7 @@ class ParticleEffect:
     modifier_to_emitter_attachments: List[Attacher] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class TextureAnimation:
     texture: Optional[str] = None
     total_frame_count: Optional[int] = None
@@ -435,7 +481,7 @@ class TextureAnimation:
     frame_stride: Optional[List[int]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Texanim:
     textureFileName: Optional[str] = None
     numFrames: Optional[int] = None
@@ -458,3 +504,47 @@ class Texanim:
             frame_size=self.frameSize,
             frame_stride=self.frameStride,
         )
+
+
+_PRIMITIVES = frozenset((str, int, float, bool))
+_SERIALIZERS: Dict[type, Callable[[Any], Any]] = {}
+
+
+def _compile_dataclass(cls: type) -> Callable[[Any], Any]:
+    lines = [f"def serialize_{cls.__name__}(obj):", "    result = {}"]
+    for f in fields(cls):
+        lines += [
+            f"    value = obj.{f.name}",
+            "    if value is not None:",
+            f"        result[{f.name!r}] = (",
+            "            value if type(value) in _PRIMITIVES else serialize(value)",
+            "        )",
+        ]
+    lines.append("    return result")
+
+    namespace: Dict[str, Any] = {"_PRIMITIVES": _PRIMITIVES, "serialize": serialize}
+    exec("\n".join(lines), namespace)
+    return namespace[f"serialize_{cls.__name__}"]
+
+
+def _compile(cls: type) -> Callable[[Any], Any]:
+    if hasattr(cls, "__serialize__"):
+        return cls.__serialize__  # type: ignore
+    elif issubclass(cls, Enum):
+        return {member: member.name.lower() for member in cls}.__getitem__  # type: ignore
+    elif issubclass(cls, list):
+        return lambda obj: [serialize(i) for i in obj]
+    elif issubclass(cls, dict):
+        return lambda obj: {k: serialize(v) for k, v in obj.items()}
+    elif is_dataclass(cls):
+        return _compile_dataclass(cls)
+    else:
+        return lambda obj: obj
+
+
+def serialize(obj: Any) -> Any:
+    cls = type(obj)
+    serializer = _SERIALIZERS.get(cls)
+    if serializer is None:
+        serializer = _SERIALIZERS[cls] = _compile(cls)
+    return serializer(obj)
@@ -0,0 +1,219 @@
+import io
+import json
+import os
+from contextlib import redirect_stdout
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.converter import SinsParticle
+from src.exceptions import ParticleException
+from src.fileutil import atomic_open
+from src.writer import write_json
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional and excluded from the exe
+    np = None  # type: ignore
+
+EXTENSIONS = (".particle", ".particle_effect")
+
+
+def require_numpy() -> None:
+    if np is None:
+        raise ParticleException("Columnar tables require NumPy: pip install numpy")
+
+
+def _flatten(obj: Dict[str, Any], prefix: str = "") -> Iterator[Tuple[str, Any]]:
+    for key, value in obj.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{prefix}{key}.")
+        else:
+            yield prefix + key, value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_vector(value: Any) -> bool:
+    return isinstance(value, list) and bool(value) and all(_is_number(v) for v in value)
+
+
+class Columns:
+    def __init__(self, id_column: str, rows: List[Dict[str, Any]], files: List[int]) -> None:
+        require_numpy()
+        self.id_column = id_column
+        self.rows = rows
+        self.integers: Set[str] = set()
+        self.columns: Dict[str, Any] = {
+            "file": np.array(files, dtype=np.int64),
+            id_column: np.array(self._ids(files), dtype=np.int64),
+        }
+
+        flat = [dict(_flatten(row)) for row in rows]
+        names: Dict[str, None] = {}
+        for row in flat:
+            names.update(dict.fromkeys(row))
+        for name in names:
+            self.columns[name] = self._column(name, [row.get(name) for row in flat])
+
+    @staticmethod
+    def _ids(files: List[int]) -> List[int]:
+        ids, last, count = [], None, 0
+        for file in files:
+            count = count + 1 if file == last else 0
+            last = file
+            ids.append(count)
+        return ids
+
+    def _column(self, name: str, values: List[Any]) -> Any:
+        present = [v for v in values if v is not None]
+        if present and all(_is_number(v) for v in present):
+            if all(isinstance(v, int) for v in present):
+                self.integers.add(name)
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+        if present and all(_is_vector(v) for v in present):
+            width = len(present[0])
+            if all(len(v) == width for v in present):
+                column = np.full((len(values), width), np.nan)
+                for i, v in enumerate(values):
+                    if v is not None:
+                        column[i] = v
+                return column
+
+        objects = np.empty(len(values), dtype=object)
+        objects[:] = values
+        return objects
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, name: str) -> Any:
+        return self.columns[name]
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        if name in ("file", self.id_column):
+            raise KeyError(f"{name} is an index column")
+        column = self.columns.get(name)
+        if column is None:
+            self.columns[name] = np.asarray(value)
+        else:
+            column[...] = value
+
+    def keys(self) -> Iterable[str]:
+        return self.columns.keys()
+
+    def _value(self, name: str, column: Any, i: int) -> Any:
+        value = column[i]
+        if column.dtype == object:
+            return value
+        if column.ndim == 2:
+            return None if np.isnan(value).all() else [float(v) for v in value]
+        if np.isnan(value):
+            return None
+        return int(value) if name in self.integers else float(value)
+
+    def store(self) -> None:
+        fields = [name for name in self.columns if name not in ("file", self.id_column)]
+        for i, row in enumerate(self.rows):
+            for name in fields:
+                value = self._value(name, self.columns[name], i)
+                *path, key = name.split(".")
+                target: Optional[Dict[str, Any]] = row
+                for part in path:
+                    if value is None and part not in target:  # type: ignore
+                        target = None
+                        break
+                    target = target.setdefault(part, {})  # type: ignore
+                if target is None:
+                    continue
+                if value is None:
+                    target.pop(key, None)
+                else:
+                    target[key] = value
+
+
+class Corpus:
+    def __init__(
+        self,
+        files: List[str],
+        documents: List[Dict[str, Any]],
+        relative: Optional[List[str]] = None,
+    ) -> None:
+        require_numpy()
+        self.files = files
+        self.documents = documents
+        self.relative = relative or [os.path.basename(file) for file in files]
+
+        emitters: List[Dict[str, Any]] = []
+        emitter_files: List[int] = []
+        modifiers: List[Dict[str, Any]] = []
+        modifier_files: List[int] = []
+        for file_id, document in enumerate(documents):
+            for emitter in document.get("emitters", []):
+                emitters.append(emitter)
+                emitter_files.append(file_id)
+            for modifier in document.get("modifiers", []):
+                modifiers.append(modifier)
+                modifier_files.append(file_id)
+
+        self.emitters = Columns("emitter", emitters, emitter_files)
+        self.modifiers = Columns("modifier", modifiers, modifier_files)
+
+    @classmethod
+    def load(cls, paths: Iterable[str]) -> "Corpus":
+        files, documents, relative = [], [], []
+        for path, name in _iter_files(paths):
+            if path.endswith(".particle_effect"):
+                with open(path) as f:
+                    document = json.load(f)
+            else:
+                with io.StringIO() as buf, redirect_stdout(buf):
+                    document = SinsParticle(path).parse().file
+            if document:
+                files.append(path)
+                documents.append(document)
+                relative.append(name)
+        return cls(files, documents, relative)
+
+    def store(self) -> None:
+        self.emitters.store()
+        self.modifiers.store()
+
+    def save(self, out_path: str, compact: bool = False) -> List[str]:
+        self.store()
+        saved: List[str] = []
+        sources: Dict[str, str] = {}
+        for path, relative in zip(self.files, self.relative):
+            save_path = os.path.join(out_path, os.path.splitext(relative)[0] + ".particle_effect")
+            other = sources.setdefault(os.path.normcase(save_path), path)
+            if other != path:
+                raise ParticleException(f"{path} and {other} would both be saved to {save_path}")
+            saved.append(save_path)
+
+        for save_path, document in zip(saved, self.documents):
+            os.makedirs(os.path.dirname(save_path), exist_ok=True)
+            with atomic_open(save_path, "w") as f:
+                write_json(document, f, None if compact else 2)
+        return saved
+
+
+def _iter_files(paths: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    # paired with the path to save under, so the layout of each directory is mirrored
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path, os.path.basename(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for file in sorted(files):
+                if file.endswith(EXTENSIONS):
+                    file = os.path.join(root, file)
+                    yield file, os.path.relpath(file, path)
+
+
+def load(paths: Iterable[str]) -> Corpus:
+    return Corpus.load(paths)
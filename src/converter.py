@@ -0,0 +1,567 @@
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+from typing import IO, Any, BinaryIO, Dict, Iterator, Optional, TextIO, Union
+
+from colorama import Fore
+
+from src import classes as c
+from src import profiling
+from src.cache import ConversionCache
+from src.events import Event, EventType, iter_events
+from src.exceptions import SinsParticleException
+from src.fileutil import ChangedFile, write_if_changed
+from src.index import IndexEntry, ParticleIndex, scan_particle
+from src.mappings import EMITTER_CONVERTERS, MODIFIER_CONVERTERS
+from src.orientation import euler
+from src.writer import write_json
+
+
+class Logger:
+    @staticmethod
+    def print(message: str, color: Any = Fore.WHITE, tab: bool = False) -> None:
+        print(color + ("\t" if tab else "") + f"{message}")
+
+    @staticmethod
+    def info(message: str, color: Any = Fore.CYAN, tab: bool = False) -> None:
+        Logger.print(f"[INFO]: {message}", color, tab)
+
+    @staticmethod
+    def warn(message: str, color: Any = Fore.YELLOW, tab: bool = False) -> None:
+        Logger.print(f"[WARN]: {message}", color, tab)
+
+    @staticmethod
+    def error(message: str, color: Any = Fore.RED, tab: bool = False) -> None:
+        Logger.print(f"[ERROR]: {message}", color, tab)
+
+
+class SinsParticle:
+    def __init__(self, particle_path: str) -> None:
+        self.collector: dict[str, Any] = {}
+
+        self.particle_path: str = particle_path
+        self.data: Optional[bytes] = None
+        self.file: Optional[Union[c.TextureAnimation, c.ParticleEffect]] = None
+        self.index: Optional[ParticleIndex] = None
+
+        self.modifiers: list[c.Modifier] = []
+        self.nodes: list[c.Node] = []
+        self.emitters: list[c.Emitter] = []
+        self.modifier_to_emitter_attachments: list[c.Attacher] = []
+        self.emitter_to_node_attachments: list[c.Attacher] = []
+        self.emitter_ids: dict[str, list[int]] = {}
+        self.fade_values: dict[str, list[dict[str, Any]]] = {}
+
+    @classmethod
+    def from_bytes(cls, data: bytes, name: str = "<memory>.particle") -> "SinsParticle":
+        particle = cls(name)
+        particle.data = data
+        return particle
+
+    @classmethod
+    def from_text(cls, text: str, name: str = "<memory>.particle") -> "SinsParticle":
+        return cls.from_bytes(text.encode("utf-8"), name)
+
+    def _parse_object(self, events: Iterator[Event], collector: dict[str, Any]) -> None:
+        for event in events:
+            if event.type in (EventType.START_EMITTER, EventType.START_AFFECTOR):
+                emitter: dict[str, Any] = {}
+                map_types = {
+                    EventType.START_EMITTER: ("Emitters", "EmitterContents"),
+                    EventType.START_AFFECTOR: ("Affectors", "AffectorContents"),
+                }
+                array, contents = map_types[event.type]
+                collector.setdefault(array, []).append(
+                    {
+                        event.key: event.value,
+                        contents: emitter,
+                    }
+                )
+                self._parse_emitter(events, emitter)
+                continue
+
+            collector[event.key] = event.value
+
+    def _collect(self, data: bytes) -> None:
+        simulation = self.collector.setdefault("ParticleSimulation", {})
+        simulation.setdefault("Emitters", [])
+        simulation.setdefault("Affectors", [])
+        self._parse_object(iter_events(data, texanim=False), simulation)
+
+    def _build_particle_effect(self) -> c.ParticleEffect:
+        self.emitter_to_node_attachments = [
+            c.Attacher(i, i)
+            for i in range(int(self.collector["ParticleSimulation"]["NumEmitters"]))
+        ]
+        self._build_modifier_to_emitter_attachments()
+        self._build_emitters()
+        self.modifiers = self._delete_fade_affectors()
+
+        return c.ParticleEffect(
+            nodes=self.nodes,
+            emitters=self.emitters,
+            modifiers=self.modifiers,
+            emitter_to_node_attachments=self.emitter_to_node_attachments,
+            modifier_to_emitter_attachments=self.modifier_to_emitter_attachments,
+        )
+
+    def parse(self) -> "SinsParticle":
+        try:
+            data = self.data
+            if data is None:
+                with profiling.span("read"), open(self.particle_path, "rb") as f:
+                    data = f.read()
+
+            if self.particle_path.endswith(".texanim"):
+                texanim = c.Texanim()
+                with profiling.span("parse"):
+                    for event in iter_events(data, texanim=True):
+                        texanim[event.key] = event.value
+                with profiling.span("build"):
+                    animation = texanim.to_texture_animation()
+                with profiling.span("serialize"):
+                    self.file = self.__serialize__(animation)
+            elif self.particle_path.endswith(".particle"):
+                with profiling.span("parse"):
+                    self._collect(data)
+                with profiling.span("build"):
+                    effect = self._build_particle_effect()
+                with profiling.span("serialize"):
+                    self.file = self.__serialize__(effect)
+        except SinsParticleException as e:
+            Logger.error(str(e))
+        except Exception as f:
+            Logger.error(f"Failed to parse: {f}")
+
+        return self
+
+    def scan(self) -> "SinsParticle":
+        try:
+            self.index = scan_particle(self.particle_path)
+        except SinsParticleException as e:
+            Logger.error(str(e))
+        except Exception as f:
+            Logger.error(f"Failed to parse: {f}")
+
+        return self
+
+    def _require_index(self) -> ParticleIndex:
+        if self.index is None:
+            self.index = scan_particle(self.particle_path)
+        return self.index
+
+    def _read_block(self, entry: IndexEntry) -> Dict[str, Any]:
+        collector: Dict[str, Any] = {}
+        self._parse_object(self._require_index().iter_events(entry), collector)
+        return collector["Emitters" if entry.kind == "EmitterType" else "Affectors"][0]
+
+    def emitter(self, emitter_id: int) -> c.Emitter:
+        index = self._require_index()
+        entry = index.emitters[emitter_id]
+
+        self.fade_values = {}
+        for affector in index.affectors:
+            if affector.type == "Fade" and entry.name in affector.attached_emitters:
+                contents = self._read_block(affector)["AffectorContents"]
+                self.fade_values.setdefault(entry.name, []).append(self._fade_value(contents))
+
+        return self._build_emitter(emitter_id, self._read_block(entry))
+
+    def modifier(self, modifier_id: int) -> c.Modifier:
+        index = self._require_index()
+        return self._build_modifier(modifier_id, self._read_block(index.affectors[modifier_id]))
+
+    def __serialize__(self, obj: Any) -> Any:
+        return c.serialize(obj)
+
+    def _convert_orientation_matrix(
+        self, Orientation: list[list[float]]
+    ) -> tuple[float, float, float]:
+        return euler(Orientation)
+
+    def _build_node_attachment(self, emitter_id: int, emitter: Any) -> None:
+        x, y, z = emitter["Position"]
+
+        yaw, pitch, roll = self._convert_orientation_matrix(emitter["Orientation"])
+
+        node = c.Node(
+            emitter_id,
+            emitter["Name"],
+            c.Vector2f(x, x),
+            c.Vector2f(y, y),
+            c.Vector2f(z, z),
+            c.Vector2f(yaw, yaw),
+            c.Vector2f(pitch, pitch),
+            c.Vector2f(roll, roll),
+        )
+        self.nodes.append(node)
+
+    def _build_emitters(self) -> None:
+        particle_simulation = self.collector["ParticleSimulation"]
+
+        for emitter_id, _emitter in enumerate(particle_simulation["Emitters"]):
+            self._build_node_attachment(emitter_id, _emitter["EmitterContents"])
+            self.emitters.append(self._build_emitter(emitter_id, _emitter))
+
+        for modifier_id, _modifier in enumerate(particle_simulation["Affectors"]):
+            self.modifiers.append(self._build_modifier(modifier_id, _modifier))
+
+    def _build_emitter(self, emitter_id: int, _emitter: Dict[str, Any]) -> c.Emitter:
+        emitter = _emitter["EmitterContents"]
+
+        facing_type = c.FacingType.parse(emitter["ParticleFacing"])
+
+        e_root: c.Emitter = c.Emitter(
+            id=emitter_id,
+            type=c.EmitterType.parse(_emitter["EmitterType"].upper()),
+            name=emitter["Name"],
+            emit_rate=c.EmitRate(),
+            particle=c.Particle(
+                mesh=c.Mesh(),
+                billboard=c.Billboard(
+                    uber_constants=c.UberConstants(basic_constants=c.BasicConstants())
+                ),
+            ),
+        )
+
+        if facing_type != c.FacingType.FACE_CAMERA:
+            e_root.particle.billboard.facing_type = facing_type
+
+        e_root.emit_rate.primary_emit_rate = c.Vector2f.uniform(emitter["EmitRate"])
+
+        if not emitter["HasInfiniteEmitCount"]:
+            e_root.emit_max_particle_count = c.Vector2f.uniform(emitter["MaxEmitCount"])
+
+        e_root.particle.billboard.width = c.Vector2f.uniform(emitter["ParticleWidth"])
+        e_root.particle.billboard.height = c.Vector2f.uniform(emitter["ParticleHeight"])
+
+        anchor = c.Anchor.parse(emitter["BillboardAnchor"])
+
+        if anchor != c.Anchor.CENTER:
+            e_root.particle.billboard.anchor = anchor
+
+        e_root.particle.max_duration = c.Vector2f.uniform(emitter["ParticleLifeTime"])
+
+        if not emitter["HasInfiniteLifeTime"]:
+            e_root.emit_duration = c.Vector2f.uniform(emitter["TotalLifeTime"])
+            if emitter["TotalLifeTime"] <= 0:
+                Logger.warn(
+                    f"{e_root.name} 'TotalLifeTime' must be > 0 if 'HasInfiniteLifeTime' is FALSE",
+                    tab=True,
+                )
+            elif emitter["TotalLifeTime"] < 0.02:
+                Logger.info(
+                    f"{e_root.name} 'TotalLifeTime' must be > 0.01 or it won't play. Defaulting to 1.0",
+                    tab=True,
+                )
+                e_root.emit_duration = c.Vector2f(1.0, 1.0)
+
+        e_root.particle.color = emitter["ParticleStartColor"]
+
+        e_root.emit_start_delay = c.Vector2f.uniform(emitter["StartTime"])
+        e_root.particle.mass = c.Vector2f.uniform(emitter["ParticleStartMass"])
+
+        if emitter["MeshName"]:
+            e_root.particle.type = c.ParticleType.MESH
+            e_root.particle.mesh.shader = c.MeshShader.SHIP
+            e_root.particle.mesh.mesh = emitter["MeshName"]
+        else:
+            e_root.particle.type = c.ParticleType.BILLBOARD
+
+        e_root.is_visible = emitter["Enabled"]
+
+        for fade in self.fade_values.get(e_root.name, ()):
+            if fade["do_fade_in"]:
+                e_root.particle.fade_in_time = c.Vector2f.uniform(fade["fade_in_time"])
+            if fade["do_fade_out"]:
+                e_root.particle.fade_out_time = c.Vector2f.uniform(fade["fade_out_time"])
+
+        if "AngleVariance" in emitter:
+            e_root.angle_variance = c.Vector2f.uniform(emitter["AngleVariance"])
+
+        if emitter["ParticlesRotate"]:
+            e_root.particle.billboard.rotation = c.Vector2f(
+                emitter["ParticleMinStartRotation"],
+                emitter["ParticleMaxStartRotation"],
+            )
+            e_root.particle.billboard.rotation_speed = c.Vector2f(
+                emitter["ParticleMinStartAngularSpeed"],
+                emitter["ParticleMaxStartAngularSpeed"],
+            )
+
+        r = e_root.particle.billboard.rotation_speed
+
+        rotation_type = c.RotationType.parse(emitter["RotationDirectionType"])
+        if rotation_type == c.RotationType.RANDOM:
+            r = c.Vector2f(-max(abs(r.min), abs(r.max)), max(abs(r.min), abs(r.max)))
+        elif rotation_type == c.RotationType.COUNTER_CLOCKWISE:
+            r = c.Vector2f(
+                min(-abs(r.min), -abs(r.max)),
+                max(-abs(r.min), -abs(r.max)),
+            )
+        elif rotation_type == c.RotationType.CLOCKWISE:
+            r = c.Vector2f(r.min, r.max)
+
+        e_root.particle.billboard.rotation_speed = r
+
+        for i, texture in enumerate(emitter["Textures"]):
+            e_root.particle.billboard[f"texture_{i}"] = texture
+
+        e_root.particle.billboard.texture_animation = emitter["textureAnimationName"]
+
+        texture_animation_first_frame = c.TextureAnimationFirstFrames.parse(
+            SinsParticle._normalize_animation_spawn_type(emitter["textureAnimationSpawnType"])
+        )
+
+        e_root.particle.billboard.texture_animation_first_frame = texture_animation_first_frame
+        e_root.particle.billboard.texture_animation_fps = c.Vector2f.uniform(
+            emitter["textureAnimationOnParticleFPS"]
+        )
+
+        convert = EMITTER_CONVERTERS.get(e_root.type) if e_root.type else None
+        if convert:
+            convert(e_root, emitter)
+
+        return e_root
+
+    def _build_modifier(self, modifier_id: int, _modifier: Dict[str, Any]) -> c.Modifier:
+        modifier = _modifier["AffectorContents"]
+        affector_type = _modifier["AffectorType"]
+
+        m_root: c.Modifier = c.Modifier(
+            id=modifier_id,
+            name=modifier["Name"] or affector_type,
+            type=c.ModifierType.parse(SinsParticle._normalize_affector_type(affector_type)),
+        )
+
+        convert = MODIFIER_CONVERTERS.get(m_root.type)
+        if convert:
+            convert(m_root, modifier)
+
+        m_root.start_delay = c.Vector2f.uniform(modifier["StartTime"])
+
+        if modifier["UseOldParticleAffectThreshold"]:
+            m_root.particle_time_offset = c.Vector2f.uniform(modifier["OldParticleAffectThreshold"])
+        if modifier["UseYoungParticleAffectThreshold"]:
+            m_root.particle_time_duration = c.Vector2f.uniform(
+                modifier["YoungParticleAffectThreshold"]
+            )
+        if not modifier["HasInfiniteLifeTime"]:
+            m_root.duration = c.Vector2f.uniform(modifier["TotalLifeTime"])
+
+        return m_root
+
+    def _build_emitter_ids(self) -> None:
+        self.emitter_ids = {}
+        for emitter_id, emitter in enumerate(self.collector["ParticleSimulation"]["Emitters"]):
+            self.emitter_ids.setdefault(emitter["EmitterContents"]["Name"], []).append(emitter_id)
+
+    def _build_modifier_to_emitter_attachments(self) -> None:
+        self._build_emitter_ids()
+        reported = set()
+
+        for attacher_id, affector in enumerate(self.collector["ParticleSimulation"]["Affectors"]):
+            contents = affector["AffectorContents"]
+
+            if "AttachedEmitters" not in contents:
+                continue
+
+            if affector["AffectorType"].lower() == "fade":
+                fade = self._fade_value(contents)
+                for attached in contents["AttachedEmitters"]:
+                    self.fade_values.setdefault(attached, []).append(fade)
+                continue
+
+            for attached in contents["AttachedEmitters"]:
+                emitter_ids = self.emitter_ids.get(attached, [])
+                if len(emitter_ids) > 1 and attached not in reported:
+                    reported.add(attached)
+                    Logger.warn(
+                        f"{contents['Name'] or affector['AffectorType']} is attached to "
+                        f"'{attached}', which names emitters {emitter_ids}. Attaching to all of them",
+                        tab=True,
+                    )
+                for attachee_id in emitter_ids:
+                    self.modifier_to_emitter_attachments.append(
+                        c.Attacher(attacher_id, attachee_id)
+                    )
+
+    @staticmethod
+    def _fade_value(contents: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "do_fade_in": contents["DoFadeIn"],
+            "do_fade_out": contents["DoFadeOut"],
+            "fade_in_time": contents["FadeInTime"],
+            "fade_out_time": contents["FadeOutTime"],
+        }
+
+    @staticmethod
+    def _normalize_texture_name(texture_name: str) -> str:
+        return os.path.basename(
+            texture_name.strip('"')
+            .lower()
+            .replace(".tga", "")
+            .replace(".dds", "")
+            .replace("-", "_")
+        )
+
+    @staticmethod
+    def _texture_name(texture_name: str) -> str:
+        texture_name = SinsParticle._normalize_texture_name(texture_name)
+        if texture_name != "":
+            texture_name += "_clr"
+        return texture_name
+
+    @staticmethod
+    def _texture_animation_name(texture_animation_name: str) -> str:
+        return f"{texture_animation_name.lower().split('.')[0]}.texture_animation"
+
+    def _parse_emitter(self, events: Iterator[Event], emitter: Dict[str, Any]) -> None:
+        for event in events:
+            if event.type in (EventType.END_EMITTER, EventType.END_AFFECTOR):
+                break
+
+            key, value = event.key, event.value
+
+            if event.type == EventType.MATRIX_ROW:
+                emitter.setdefault(key, []).append(value)
+                continue
+
+            if key == "textureName":
+                emitter.setdefault("Textures", []).append(SinsParticle._texture_name(value))
+                continue
+
+            if key == "attachedEmitterName":
+                emitter.setdefault("AttachedEmitters", []).append(value)
+                continue
+
+            if key == "numTextures":
+                emitter.setdefault("Textures", [])
+
+            emitter[key] = value
+            if key == "textureAnimationName" and value:
+                emitter["textureAnimationName"] = SinsParticle._texture_animation_name(value)
+
+    @staticmethod
+    def _normalize_affector_type(affector_type: str) -> str:
+        return {
+            "LinearForceToPoint": "PUSH",
+            "Jitter": "JITTER",
+            "LinearInflate": "SIZE",
+            "SizeOscillator": "SIZE_OSCILLATOR",
+            "Fade": "FADE",
+            "ColorOscillator": "COLOR",
+            "LinearForceInDirection": "LINEAR_FORCE_IN_DIRECTION",
+            "RotateAboutAxis": "ROTATE_ABOUT_AXIS",
+            "KillParticlesNearPoint": "KILL",
+            "Drag": "DRAG",
+            "LinearBoundedInflate": "LINEAR_BOUNDED_INFLATE",
+        }.get(affector_type, affector_type)
+
+    @staticmethod
+    def _normalize_animation_spawn_type(spawn_type: str) -> str:
+        return {
+            "SequentialFrames": "SEQUENTIAL",
+            "RandomFrames": "RANDOM",
+            "FirstFrame": "FIRST",
+        }.get(spawn_type, spawn_type)
+
+    def _delete_fade_affectors(self) -> list[c.Modifier]:
+        return [x for x in self.modifiers if x.type != c.ModifierType.FADE]
+
+    def save(
+        self,
+        save_path: str = "examples/Ability_CombatNanites.particle_effect",
+        compact: bool = False,
+    ) -> int:
+        if not self.file:
+            return 0
+        output = ChangedFile(save_path)
+        with profiling.span("save"), output as f:
+            self.dump(f, compact)
+        return output.size if output.changed else 0
+
+    def dump(self, stream: IO[str], compact: bool = False) -> int:
+        if not self.file:
+            return 0
+        return write_json(self.file, stream, None if compact else 2)
+
+    def dumps(self, compact: bool = False) -> str:
+        with io.StringIO() as buf:
+            self.dump(buf, compact)
+            return buf.getvalue()
+
+    def dumpb(self, compact: bool = False) -> bytes:
+        # encoded chunk by chunk as the writer flushes, with the newlines a text mode file has
+        with io.BytesIO() as buf:
+            stream = io.TextIOWrapper(buf, "utf-8")
+            self.dump(stream, compact)
+            stream.detach()
+            return buf.getvalue()
+
+
+def output_target(file: str, out_path: str) -> Optional[tuple[str, str]]:
+    if file.endswith(".particle"):
+        return os.path.join(out_path, "effects"), ".particle_effect"
+    elif file.endswith(".texanim"):
+        return os.path.join(out_path, "texture_animations"), ".texture_animation"
+    return None
+
+
+def convert_output(
+    file: str,
+    extension: str,
+    cache: Optional[ConversionCache] = None,
+    compact: bool = False,
+    data: Optional[bytes] = None,
+) -> tuple[str, Optional[bytes]]:
+    key = None
+    if cache:
+        if data is None:
+            with open(file, "rb") as f:
+                data = f.read()
+        key = cache.key(data, extension)
+        output = cache.get(key)
+        if output is not None:
+            return "cached", output
+
+    if data is None:
+        parser = SinsParticle(particle_path=file).parse()
+    else:
+        parser = SinsParticle.from_bytes(data, file).parse()
+    if not parser.file:
+        return "failed", None
+
+    with profiling.span("save"):
+        output = parser.dumpb(compact)
+    if cache and key:
+        cache.put(key, output)
+    return "converted", output
+
+
+def convert_file(
+    file: str,
+    save_path: str,
+    cache: Optional[ConversionCache] = None,
+    compact: bool = False,
+    data: Optional[bytes] = None,
+) -> str:
+    status, output = convert_output(file, os.path.splitext(save_path)[1], cache, compact, data)
+    if output is not None:
+        with profiling.span("save"):
+            write_if_changed(save_path, output)
+    return status
+
+
+def convert_stream(
+    source: BinaryIO, target: TextIO, compact: bool = False, name: str = "<stdin>.particle"
+) -> str:
+    # the target is usually stdout, so log to stderr to keep it pure JSON
+    with redirect_stdout(sys.stderr):
+        parser = SinsParticle.from_bytes(source.read(), name).parse()
+    if not parser.file:
+        return "failed"
+    parser.dump(target, compact)
+    target.flush()
+    return "converted"
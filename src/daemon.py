@@ -0,0 +1,243 @@
+import argparse
+import getpass
+import io
+import json
+import os
+import secrets
+import signal
+import socket
+import socketserver
+import stat
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src import __version__
+
+# the client half runs before the converter is imported, so keep this module on the stdlib
+
+HOST = "127.0.0.1"
+LOCAL_OPTIONS = {"-", "-h", "--help", "--watch", "--serve", "--daemon", "--no-daemon"}
+PATHS = (
+    "out",
+    "cache",
+    "profile",
+    "profile_stacks",
+    "dedup_store",
+    "dedup_report",
+    "bundle",
+    "deps",
+)
+# the conversion reads these, the daemon's own values belong to whichever client spawned it
+ENVIRONMENT = ("SOURCE_DATE_EPOCH",)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ParseArgs = Callable[[List[str]], argparse.Namespace]
+Run = Callable[[argparse.Namespace], int]
+
+
+def build() -> str:
+    # a daemon left running from an older exe or checkout must not serve newer clients
+    if getattr(sys, "frozen", False):
+        return f"{__version__}:{os.path.getmtime(sys.executable)}"
+    sources = [os.path.join(ROOT, "particle_converter.py")]
+    src = os.path.join(ROOT, "src")
+    sources += [os.path.join(src, name) for name in os.listdir(src) if name.endswith(".py")]
+    return f"{__version__}:{max(os.path.getmtime(source) for source in sources)}"
+
+
+def state_path() -> str:
+    return os.path.join(tempfile.gettempdir(), f"ParticleConverter-{getpass.getuser()}.json")
+
+
+def _read_state() -> Optional[Dict[str, Any]]:
+    try:
+        with open(state_path()) as f:
+            # another user can plant the file in a shared temp directory to receive our drops
+            if hasattr(os, "getuid"):
+                info = os.fstat(f.fileno())
+                if info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) != 0o600:
+                    return None
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def forwardable(argv: List[str]) -> bool:
+    return bool(argv) and not any(arg.split("=", 1)[0] in LOCAL_OPTIONS for arg in argv)
+
+
+def _request(token: str, argv: List[str]) -> Dict[str, Any]:
+    env = {name: os.environ[name] for name in ENVIRONMENT if name in os.environ}
+    return {"token": token, "build": build(), "argv": argv, "cwd": os.getcwd(), "env": env}
+
+
+def forward(argv: List[str]) -> Optional[int]:
+    state = _read_state()
+    if state is None:
+        return None
+    try:
+        connection = socket.create_connection((HOST, state["port"]), timeout=1)
+    except OSError:
+        return None
+
+    output = sys.stdout
+    with connection, connection.makefile("rwb") as stream:
+        connection.settimeout(None)
+        message = _request(state["token"], argv)
+        stream.write(json.dumps(message).encode("utf-8") + b"\n")
+        stream.flush()
+
+        for line in stream:
+            if line.startswith(b"\0"):
+                status = line[1:].strip().decode("ascii")
+                return int(status) if status.isdigit() else None
+            output.write(line.decode("utf-8"))
+            output.flush()
+    # the daemon went away mid-run, conversions are atomic so running them again is safe
+    return None
+
+
+def hand_off(argv: List[str]) -> None:
+    if not forwardable(argv):
+        return
+    import colorama
+
+    colorama.just_fix_windows_console()
+    code = forward(argv)
+    if code is None:
+        return
+    print(colorama.Style.RESET_ALL, end="")
+    if "--no-pause" not in argv:
+        os.system("pause")
+    sys.exit(code)
+
+
+def spawn(idle_timeout: float) -> None:
+    command = [sys.executable]
+    if not getattr(sys, "frozen", False):
+        command.append(os.path.join(ROOT, "particle_converter.py"))
+    command += ["--daemon", "--idle-timeout", str(idle_timeout)]
+
+    options: Dict[str, Any] = {}
+    if sys.platform == "win32":
+        options["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        options["start_new_session"] = True
+    subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+        **options,
+    )
+
+
+def _parse(parse_args: ParseArgs, argv: List[str], cwd: str) -> Optional[argparse.Namespace]:
+    try:
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            args = parse_args(argv)
+    except SystemExit:
+        return None  # the client reports usage errors itself
+    args.files = [os.path.join(cwd, file) for file in args.files]
+    for name in PATHS:
+        if getattr(args, name):
+            setattr(args, name, os.path.join(cwd, getattr(args, name)))
+    return args
+
+
+@contextmanager
+def _environment(env: Dict[str, str]) -> Iterator[None]:
+    saved = {name: os.environ.get(name) for name in ENVIRONMENT}
+    try:
+        for name in ENVIRONMENT:
+            os.environ.pop(name, None)
+            if name in env:
+                os.environ[name] = env[name]
+        yield
+    finally:
+        for name, value in saved.items():
+            os.environ.pop(name, None)
+            if value is not None:
+                os.environ[name] = value
+
+
+class Handler(socketserver.StreamRequestHandler):
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        from colorama import Fore
+
+        from src.converter import Logger
+
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        if request.get("token") != self.server.token:
+            return
+        if request.get("build") != self.server.build:
+            self.wfile.write(b"\0stale\n")
+            self.server.stopped = True
+            return
+        args = _parse(self.server.parse_args, request["argv"], request["cwd"])
+        if args is None:
+            self.wfile.write(b"\0declined\n")
+            return
+
+        output = io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=True)  # type: ignore
+        with redirect_stdout(output), _environment(request.get("env", {})):
+            try:
+                code = self.server.run(args)
+            except Exception as e:
+                Logger.error(f"Failed to convert: {e}")
+                code = 1
+            Logger.print("-" * 50 + "Finished" + "-" * 50, Fore.GREEN)
+        output.write(f"\0{code}\n")
+        output.detach()
+
+
+class DaemonServer(socketserver.TCPServer):
+    def __init__(self, idle_timeout: float, parse_args: ParseArgs, run: Run) -> None:
+        super().__init__((HOST, 0), Handler)
+        # the command line lives in the entry script, which hands its parser and runner over
+        self.parse_args = parse_args
+        self.run = run
+        self.timeout = idle_timeout
+        self.token = secrets.token_hex(16)
+        self.build = build()
+        self.stopped = False
+
+    def handle_timeout(self) -> None:
+        self.stopped = True
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        pass  # the client disconnected, it falls back to converting in-process
+
+
+def serve(parse_args: ParseArgs, run: Run, idle_timeout: float = 600) -> None:
+    state = _read_state()
+    if state is not None:
+        try:
+            socket.create_connection((HOST, state["port"]), timeout=1).close()
+            return
+        except OSError:
+            pass
+
+    from src.fileutil import atomic_write
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    server = DaemonServer(idle_timeout, parse_args, run)
+    state = {"port": server.server_address[1], "token": server.token, "pid": os.getpid()}
+    # the token in the state file is the only thing keeping other local users out
+    atomic_write(state_path(), json.dumps(state), permissions=0o600)
+    try:
+        while not server.stopped:
+            server.handle_request()
+    finally:
+        server.server_close()
+        if _read_state() == state:
+            os.remove(state_path())
@@ -0,0 +1,217 @@
+import re
+from typing import Any, Callable, Dict, List, Union
+
+Decoder = Callable[[str], Any]
+
+_BOOLEANS = {"TRUE": True, "FALSE": False}
+_INTEGER = re.compile(r"[-+]?\d+")
+_FLOAT = re.compile(r"[-+]?(\d+\.\d*|\.\d+|\d+)([eE][-+]?\d+)?")
+
+
+def decode_float(value: str) -> float:
+    return float(value)
+
+
+def decode_int(value: str) -> int:
+    return int(value)
+
+
+def decode_bool(value: str) -> bool:
+    try:
+        return _BOOLEANS[value]
+    except KeyError:
+        raise ValueError(f"expected TRUE or FALSE, got {value}") from None
+
+
+def decode_string(value: str) -> str:
+    return value.strip('"')
+
+
+def decode_color(value: str) -> str:
+    color = value.strip('"')
+    int(color, 16)
+    return color
+
+
+def decode_vector(value: str) -> List[float]:
+    return list(map(float, value.strip("[] ").replace(",", " ").split()))
+
+
+def decode_int_vector(value: str) -> List[Union[int, float]]:
+    result: List[Union[int, float]] = []
+    for x in decode_vector(value):
+        result.append(int(x) if x.is_integer() else x)
+    return result
+
+
+decode_matrix_row = decode_vector
+
+
+def decode_any(value: str) -> Any:
+    if not value:
+        return value
+
+    first = value[0]
+    if first == '"':
+        return value.strip('"')
+    if first == "[":
+        return decode_vector(value) if "," not in value else decode_int_vector(value)
+    if value in _BOOLEANS:
+        return _BOOLEANS[value]
+    if _INTEGER.fullmatch(value):
+        return int(value)
+    if _FLOAT.fullmatch(value):
+        return float(value)
+
+    return value
+
+
+SIMULATION_DECODERS: Dict[str, Decoder] = {
+    "HasInfiniteLifeTime": decode_bool,
+    "TotalLifeTime": decode_float,
+    "NumEmitters": decode_int,
+    "NumAffectors": decode_int,
+    "EmitterType": decode_string,
+    "AffectorType": decode_string,
+    "length": decode_float,
+}
+
+EMITTER_DECODERS: Dict[str, Decoder] = {
+    "Name": decode_string,
+    "Enabled": decode_bool,
+    "EmitRate": decode_float,
+    "HasInfiniteEmitCount": decode_bool,
+    "MaxEmitCount": decode_int,
+    "hasEmitIntervals": decode_bool,
+    "emitIntervalRunDuration": decode_float,
+    "emitIntervalWaitDuration": decode_float,
+    "ParticleLifeTime": decode_float,
+    "ParticleMinStartLinearSpeed": decode_float,
+    "ParticleMaxStartLinearSpeed": decode_float,
+    "ParticleMinStartAngularSpeed": decode_float,
+    "ParticleMaxStartAngularSpeed": decode_float,
+    "ParticleMinStartRotation": decode_float,
+    "ParticleMaxStartRotation": decode_float,
+    "ParticleStartMass": decode_float,
+    "ParticleStartColor": decode_color,
+    "ParticleWidth": decode_float,
+    "ParticleHeight": decode_float,
+    "MeshName": decode_string,
+    "Position": decode_vector,
+    "Orientation": decode_matrix_row,
+    "RotateAboutForward": decode_float,
+    "RotateAboutUp": decode_float,
+    "RotateAboutCross": decode_float,
+    "StartTime": decode_float,
+    "HasInfiniteLifeTime": decode_bool,
+    "TotalLifeTime": decode_float,
+    "BillboardAnchor": decode_int,
+    "ParticleFacing": decode_int,
+    "PipelineEffectID": decode_string,
+    "AreParticlesAttached": decode_bool,
+    "numTextures": decode_int,
+    "textureName": decode_string,
+    "textureAnimationName": decode_string,
+    "textureAnimationSpawnType": decode_string,
+    "textureAnimationOnParticleFPS": decode_float,
+    "ParticlesRotate": decode_bool,
+    "MeshParticleRotationAxisType": decode_int,
+    "MeshParticleRotationAxis": decode_vector,
+    "RotationDirectionType": decode_int,
+    # Point
+    "AngleVariance": decode_float,
+    # Ring
+    "RingRadiusXMin": decode_float,
+    "RingRadiusXMax": decode_float,
+    "RingRadiusYMin": decode_float,
+    "RingRadiusYMax": decode_float,
+    "ParticleMaxStartSpeedTangential": decode_float,
+    "ParticleMaxStartSpeedRingNormal": decode_float,
+    "SpawnAngleStart": decode_float,
+    "SpawnAngleStop": decode_float,
+    "minSpawnHeight": decode_float,
+    "maxSpawnHeight": decode_float,
+    "spawnDirectionIsParallelToPlane": decode_bool,
+    "isSpawnAngleRandom": decode_bool,
+    "nonRandomSpawnLoopEmittedParticleCount": decode_int,
+    # Sphere
+    "SphereRadiusXMax": decode_float,
+    "SphereRadiusXMin": decode_float,
+    "SphereRadiusYMax": decode_float,
+    "SphereRadiusYMin": decode_float,
+    "SphereRadiusZMax": decode_float,
+    "SphereRadiusZMin": decode_float,
+    "ParticleMaxStartSpeedAzimuthalTangential": decode_float,
+    "ParticleMaxStartSpeedPolarTangential": decode_float,
+    "SpawnAngleLatitudinalStart": decode_float,
+    "SpawnAngleLatitudinalStop": decode_float,
+    "SpawnAngleLongitudinalStart": decode_float,
+    "SpawnAngleLongitudinalStop": decode_float,
+    # Ring & Sphere
+    "ScaleStartSpeedsByRadius": decode_bool,
+}
+
+AFFECTOR_DECODERS: Dict[str, Decoder] = {
+    "Name": decode_string,
+    "Enabled": decode_bool,
+    "StartTime": decode_float,
+    "HasInfiniteLifeTime": decode_bool,
+    "TotalLifeTime": decode_float,
+    "UseYoungParticleAffectThreshold": decode_bool,
+    "YoungParticleAffectThreshold": decode_float,
+    "UseOldParticleAffectThreshold": decode_bool,
+    "OldParticleAffectThreshold": decode_float,
+    "AffectAttachedParticles": decode_bool,
+    "numAttachedEmitters": decode_int,
+    "attachedEmitterName": decode_string,
+    # LinearInflate
+    "WidthInflateRate": decode_float,
+    "HeightInflateRate": decode_float,
+    # Fade
+    "DoFadeOut": decode_bool,
+    "FadeOutTime": decode_float,
+    "DoFadeIn": decode_bool,
+    "FadeInTime": decode_float,
+    # LinearForceToPoint, LinearForceInDirection
+    "MinForce": decode_float,
+    "MaxForce": decode_float,
+    "Point": decode_vector,
+    "Direction": decode_vector,
+    # ColorOscillator
+    "TransitionPeriod": decode_float,
+    "StartColor": decode_color,
+    "StartAlpha": decode_float,
+    "EndColor": decode_color,
+    "EndAlpha": decode_float,
+    # Jitter
+    "JitterForce": decode_float,
+    "UseCommonForce": decode_bool,
+    # SizeOscillator
+    "BeginSizeX": decode_float,
+    "BeginSizeY": decode_float,
+    "EndSizeX": decode_float,
+    "EndSizeY": decode_float,
+    # RotateAboutAxis
+    "AngularVelocity": decode_float,
+    "Radius": decode_float,
+    "AxisOfRotation": decode_vector,
+    "AxisOrigin": decode_vector,
+    # KillParticlesNearPoint
+    "Distance": decode_float,
+    # Drag
+    "DragCoefficient": decode_float,
+    # LinearBoundedInflate
+    "MinWidth": decode_float,
+    "MaxWidth": decode_float,
+    "MinHeight": decode_float,
+    "MaxHeight": decode_float,
+}
+
+TEXANIM_DECODERS: Dict[str, Decoder] = {
+    "textureFileName": decode_string,
+    "numFrames": decode_int,
+    "numFramesPerRow": decode_int,
+    "startTopLeft": decode_int_vector,
+    "frameSize": decode_int_vector,
+    "frameStride": decode_int_vector,
+}
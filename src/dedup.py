@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List
+
+from src.fileutil import atomic_link, atomic_open, atomic_write
+
+
+class DedupStore:
+    def __init__(self, path: str, copy: bool = False) -> None:
+        self.path = path
+        self.copy = copy
+        self.linked = 0
+        self.groups: Dict[str, List[str]] = {}
+        self.sizes: Dict[str, int] = {}
+
+    def _object_path(self, digest: str, extension: str) -> str:
+        return os.path.join(self.path, digest[:2], digest + extension)
+
+    def add(self, target: str) -> str:
+        with open(target, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+
+        # copies stay in the output tree, so nothing would ever link to a stored object
+        if not self.copy:
+            self._link(self._object_path(digest, os.path.splitext(target)[1]), target, data)
+
+        self.groups.setdefault(digest, []).append(target)
+        self.sizes[digest] = len(data)
+        return digest
+
+    def _link(self, entry: str, target: str, data: bytes) -> None:
+        if not os.path.exists(entry):
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            atomic_write(entry, data)
+
+        # outputs are only ever replaced, never written in place, so linked objects stay intact
+        if not os.path.samefile(entry, target):
+            try:
+                atomic_link(entry, target)
+                self.linked += 1
+            except OSError:
+                pass  # no hardlinks on this filesystem, the converted copy stays
+
+    def prune(self) -> int:
+        # an object with a single link is no longer referenced by any output, this also clears
+        # what an earlier hardlinked run left behind once its outputs are replaced
+        removed = 0
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                entry = os.path.join(root, name)
+                if name.endswith(".json") or os.stat(entry).st_nlink > 1:
+                    continue
+                os.remove(entry)
+                removed += 1
+        return removed
+
+    def duplicates(self) -> List[str]:
+        groups = [digest for digest, targets in self.groups.items() if len(targets) > 1]
+        return sorted(groups, key=lambda d: (-self.sizes[d] * (len(self.groups[d]) - 1), d))
+
+    @property
+    def saved_bytes(self) -> int:
+        return sum(self.sizes[d] * (len(self.groups[d]) - 1) for d in self.groups)
+
+    def report(self, out_path: str) -> Dict[str, Any]:
+        return {
+            "files": sum(len(targets) for targets in self.groups.values()),
+            "unique": len(self.groups),
+            "bytes": sum(self.sizes[d] * len(self.groups[d]) for d in self.groups),
+            "saved_bytes": self.saved_bytes,
+            "duplicates": [
+                {
+                    "hash": digest,
+                    "size": self.sizes[digest],
+                    "files": sorted(
+                        os.path.relpath(target, out_path) for target in self.groups[digest]
+                    ),
+                }
+                for digest in self.duplicates()
+            ],
+        }
+
+    def save_report(self, path: str, out_path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with atomic_open(path, "w") as f:
+            json.dump(self.report(out_path), f, indent=2)
@@ -0,0 +1,132 @@
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from src import archive
+from src.fileutil import atomic_open
+
+VERSION = 1
+KINDS = ("textures", "texture_animations", "meshes")
+
+_REFERENCES = re.compile(rb'"(texture_\d+|texture_animation|mesh)": ?"((?:[^"\\]|\\.)*)"')
+_KINDS = {b"texture_animation": 1, b"mesh": 2}
+
+
+@dataclass
+class References:
+    textures: List[str] = field(default_factory=list)
+    texture_animations: List[str] = field(default_factory=list)
+    meshes: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Entry:
+    target: str
+    signature: List[int]
+    textures: List[str] = field(default_factory=list)
+    texture_animations: List[str] = field(default_factory=list)
+    meshes: List[str] = field(default_factory=list)
+
+
+def references(output: bytes) -> References:
+    # scanned from the converted effect so cache hits and fresh conversions agree, these keys
+    # only ever hold asset names so this is a third of the cost of a full json.loads
+    found: List[Set[str]] = [set(), set(), set()]
+    for match in _REFERENCES.finditer(output):
+        value = match.group(2)
+        if value:
+            name = json.loads(b'"' + value + b'"') if b"\\" in value else value.decode("utf-8")
+            found[_KINDS.get(match.group(1), 0)].add(name)
+    return References(*(sorted(names) for names in found))
+
+
+def signature(source: str, member: Optional[str] = None) -> List[int]:
+    if member:
+        return list(archive.member_signature(source, member))
+    try:
+        stat = os.stat(source)
+    except OSError:
+        return []
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _exists(key: str) -> bool:
+    # archive members are keyed as archive/member, so look for the archive above them
+    path = key
+    while not os.path.isfile(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            return False
+        path = parent
+    return path == key or archive.has_member(path, key[len(path) + 1 :])
+
+
+class DependencyIndex:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.root = os.path.dirname(os.path.abspath(path))
+        self.entries: Dict[str, Entry] = {}
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == VERSION:
+            self.entries = {key: Entry(**entry) for key, entry in data["sources"].items()}
+
+    def _relative(self, target: str) -> str:
+        return os.path.relpath(target, self.root).replace(os.sep, "/")
+
+    def stale(self, key: str, signature: List[int], target: str) -> bool:
+        entry = self.entries.get(key)
+        return entry is None or entry.signature != signature or not os.path.isfile(target)
+
+    def update(
+        self, key: str, target: str, signature: List[int], refs: Optional[References]
+    ) -> None:
+        refs = refs or References()
+        self.entries[key] = Entry(
+            self._relative(target), signature, refs.textures, refs.texture_animations, refs.meshes
+        )
+
+    def prune(self) -> None:
+        for key in list(self.entries):
+            if not _exists(key):
+                del self.entries[key]
+
+    def provided(self) -> Set[str]:
+        return {
+            os.path.basename(entry.target).lower()
+            for entry in self.entries.values()
+            if entry.target.endswith(".texture_animation")
+        }
+
+    def reverse(self) -> Dict[str, Dict[str, List[str]]]:
+        reverse: Dict[str, Dict[str, List[str]]] = {kind: {} for kind in KINDS}
+        for entry in sorted(self.entries.values(), key=lambda entry: entry.target):
+            for kind in KINDS:
+                for name in getattr(entry, kind):
+                    reverse[kind].setdefault(name, []).append(entry.target)
+        return reverse
+
+    def dangling(self) -> Dict[str, List[str]]:
+        # textures and meshes come from outside the converter, only its own outputs are known
+        provided = self.provided()
+        animations = self.reverse()["texture_animations"]
+        return {
+            name: targets
+            for name, targets in sorted(animations.items())
+            if name.lower() not in provided
+        }
+
+    def save(self) -> None:
+        data = {
+            "version": VERSION,
+            "sources": {key: vars(entry) for key, entry in sorted(self.entries.items())},
+            "reverse": self.reverse(),
+            "dangling": self.dangling(),
+        }
+        with atomic_open(self.path, "w") as f:
+            f.write(json.dumps(data))
@@ -0,0 +1,176 @@
+import codecs
+import io
+import os
+from enum import Enum, auto
+from typing import IO, Any, Dict, Iterator, NamedTuple, Optional, Tuple, Union
+
+from src import decoders as d
+from src.exceptions import SinsParticleException, SinsParticleFormatException
+from src.tokenizer import Token, iter_tokens
+
+Source = Union[str, "os.PathLike[str]", bytes, IO[bytes], IO[str]]
+
+CHUNK_SIZE = 1 << 16
+BIN_MAGIC = b"BIN"
+
+
+class EventType(Enum):
+    VALUE = auto()
+    MATRIX_ROW = auto()
+    START_EMITTER = auto()
+    END_EMITTER = auto()
+    START_AFFECTOR = auto()
+    END_AFFECTOR = auto()
+
+
+class Event(NamedTuple):
+    type: EventType
+    key: str
+    value: Any
+    line_number: int
+
+
+BLOCKS: Dict[str, Tuple[EventType, EventType, str, Dict[str, d.Decoder]]] = {
+    "EmitterType": (
+        EventType.START_EMITTER,
+        EventType.END_EMITTER,
+        "EmitterContents",
+        d.EMITTER_DECODERS,
+    ),
+    "AffectorType": (
+        EventType.START_AFFECTOR,
+        EventType.END_AFFECTOR,
+        "AffectorContents",
+        d.AFFECTOR_DECODERS,
+    ),
+}
+
+
+def decode(decoders: Dict[str, d.Decoder], token: Token) -> Any:
+    try:
+        return decoders.get(token.key, d.decode_any)(token.value)
+    except ValueError as e:
+        raise SinsParticleException(
+            f'Invalid value for "{token.key}" in line: {token.line_number}\n{e}'
+        )
+
+
+def _expect(token: Optional[Token], expected: str, line_number: int) -> Token:
+    if token is None or expected not in token.key:
+        raise SinsParticleFormatException(expected, token.line_number if token else line_number)
+    return token
+
+
+def _iter_text_events(tokens: Iterator[Token], texanim: Optional[bool]) -> Iterator[Event]:
+    _expect(next(tokens, None), "TXT", 1)
+    token = next(tokens, None)
+    if token and token.key.lower() == "sinsarchiveversion":
+        token = next(tokens, None)
+
+    if texanim or (texanim is None and (token is None or token.key != "ParticleSimulation")):
+        while token:
+            yield Event(
+                EventType.VALUE, token.key, decode(d.TEXANIM_DECODERS, token), token.line_number
+            )
+            token = next(tokens, None)
+        return
+
+    token = _expect(token, "ParticleSimulation", 2)
+    yield from _iter_simulation_events(tokens, token.line_number)
+
+
+def _iter_simulation_events(
+    tokens: Iterator[Token], line_number: int, header: bool = True
+) -> Iterator[Event]:
+    end: Optional[EventType] = None
+    decoders = d.SIMULATION_DECODERS
+    count = 0
+
+    token = next(tokens, None)
+    while token:
+        line_number = token.line_number
+
+        if token.depth <= 1:
+            if end:
+                yield Event(end, "", None, line_number)
+                end, decoders = None, d.SIMULATION_DECODERS
+            if token.depth == 0:
+                break
+
+            count += 1
+            if header and count == 3:
+                _expect(token, "NumEmitters", line_number)
+
+            value = decode(d.SIMULATION_DECODERS, token)
+            if token.key in BLOCKS:
+                start, end, contents, decoders = BLOCKS[token.key]
+                _expect(next(tokens, None), contents, line_number + 1)
+                yield Event(start, token.key, value, line_number)
+            else:
+                yield Event(EventType.VALUE, token.key, value, line_number)
+            token = next(tokens, None)
+            continue
+
+        if end is None:
+            raise SinsParticleException(f"Unexpected indentation in line: {line_number}")
+
+        next_token = next(tokens, None)
+        if next_token and next_token.depth > token.depth:
+            _expect(token, "Orientation", line_number)
+            while next_token and next_token.depth > token.depth:
+                yield Event(
+                    EventType.MATRIX_ROW,
+                    token.key,
+                    d.decode_matrix_row(next_token.text),
+                    next_token.line_number,
+                )
+                next_token = next(tokens, None)
+        else:
+            yield Event(EventType.VALUE, token.key, decode(decoders, token), line_number)
+        token = next_token
+
+    if end:
+        yield Event(end, "", None, line_number)
+
+
+def iter_block_events(data: bytes, line_number: int = 1) -> Iterator[Event]:
+    lines = data.decode("utf-8-sig").splitlines()
+    yield from _iter_simulation_events(iter_tokens(lines, line_number), line_number, False)
+
+
+def _iter_lines(stream: IO[bytes], head: bytes) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    chunk = head
+    while chunk:
+        lines = (pending + decoder.decode(chunk)).split("\n")
+        pending = lines.pop()
+        yield from lines
+        chunk = stream.read(CHUNK_SIZE)
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def check_text(head: bytes) -> None:
+    if head[:3] == BIN_MAGIC:
+        raise SinsParticleException("Convert it to TXT format before running this program.")
+
+
+def iter_events(source: Source, texanim: Optional[bool] = None) -> Iterator[Event]:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source)
+        check_text(data)
+        lines = data.decode("utf-8-sig").splitlines()
+        yield from _iter_text_events(iter_tokens(lines), texanim)
+    elif isinstance(source, (str, os.PathLike)):
+        if texanim is None and os.fspath(source).endswith(".texanim"):
+            texanim = True
+        with open(source, "rb") as f:
+            yield from iter_events(f, texanim)
+    elif isinstance(source, io.TextIOBase):
+        yield from _iter_text_events(iter_tokens(source), texanim)
+    else:
+        head = source.read(3)
+        check_text(head)  # type: ignore
+        yield from _iter_text_events(iter_tokens(_iter_lines(source, head)), texanim)  # type: ignore
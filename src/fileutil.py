@@ -0,0 +1,168 @@
+import io
+import os
+import stat
+import sys
+import tempfile
+from contextlib import ExitStack, contextmanager
+from types import TracebackType
+from typing import IO, Any, Iterator, Optional, Type, Union
+
+CHUNK_SIZE = 1 << 16
+
+
+def _umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+_UMASK = _umask()
+
+
+def _mode(path: str) -> int:
+    # mkstemp creates owner-only files, give the output the mode a plain open() would have
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = "w", permissions: Optional[int] = None) -> Iterator[IO[Any]]:
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+        os.chmod(tmp, _mode(path) if permissions is None else permissions)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def atomic_write(path: str, data: Union[str, bytes], permissions: Optional[int] = None) -> None:
+    with atomic_open(path, "wb" if isinstance(data, bytes) else "w", permissions) as f:
+        f.write(data)
+
+
+class _Compare(io.RawIOBase):
+    # reads the existing file alongside the writes and only starts the atomic copy at the
+    # first byte that differs, so an unchanged output is never written or held in memory
+    def __init__(self, path: str, stack: ExitStack) -> None:
+        super().__init__()
+        self.path = path
+        self.stack = stack
+        self.size = 0
+        self.tmp: Optional[IO[bytes]] = None
+        self.existing: Optional[IO[bytes]] = None
+        try:
+            self.existing = stack.enter_context(open(path, "rb"))
+        except OSError:
+            pass
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        # archive writers ask for the position even when they only write forwards
+        return self.size
+
+    def write(self, data: Any) -> int:
+        view = memoryview(data).cast("B")
+        if self.tmp is None and not self._matches(view):
+            self._diverge()
+        if self.tmp is not None:
+            self.tmp.write(view)
+        self.size += len(view)
+        return len(view)
+
+    def _matches(self, view: memoryview) -> bool:
+        if self.existing is None:
+            return False
+        for start in range(0, len(view), CHUNK_SIZE):
+            chunk = view[start : start + CHUNK_SIZE]
+            if self.existing.read(len(chunk)) != chunk:
+                return False
+        return True
+
+    def _diverge(self) -> None:
+        self.tmp = self.stack.enter_context(atomic_open(self.path, "wb"))
+        if self.existing is None:
+            return
+        self.existing.seek(0)
+        remaining = self.size
+        while remaining:
+            chunk = self.existing.read(min(remaining, CHUNK_SIZE))
+            if not chunk:
+                break
+            self.tmp.write(chunk)
+            remaining -= len(chunk)
+
+    def finish(self) -> bool:
+        if self.tmp is None and (self.existing is None or self.existing.read(1)):
+            self._diverge()
+        if self.existing is not None:
+            # Windows can't replace a file that is still open
+            self.existing.close()
+        return self.tmp is not None
+
+
+class ChangedFile:
+    """Streams to path atomically, leaving it untouched if the same bytes were written."""
+
+    def __init__(self, path: str, mode: str = "w") -> None:
+        self.path = path
+        self.mode = mode
+        self.changed = False
+        self.size = 0
+
+    def __enter__(self) -> IO[Any]:
+        self.stack = ExitStack()
+        self.raw = _Compare(self.path, self.stack)
+        buffer = io.BufferedWriter(self.raw, CHUNK_SIZE)
+        # text mode translates newlines like a plain open() on this platform
+        self.stream: IO[Any] = buffer if "b" in self.mode else io.TextIOWrapper(buffer, "utf-8")
+        return self.stream
+
+    def __exit__(
+        self,
+        kind: Optional[Type[BaseException]],
+        value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        try:
+            if kind is None:
+                self.stream.flush()
+                self.changed = self.raw.finish()
+                self.size = self.raw.size
+        except BaseException:
+            kind, value, traceback = sys.exc_info()
+            raise
+        finally:
+            # a closed raw file stops the wrappers flushing into it when they are collected
+            self.raw.close()
+            self.stack.__exit__(kind, value, traceback)
+
+
+def write_if_changed(path: str, data: bytes) -> bool:
+    # leave identical outputs untouched so their mtime doesn't trigger downstream rebuilds
+    output = ChangedFile(path, "wb")
+    with output as f:
+        f.write(data)
+    return output.changed
+
+
+def atomic_link(source: str, path: str) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    os.close(fd)
+    os.remove(tmp)
+    try:
+        os.link(source, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
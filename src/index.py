@@ -0,0 +1,97 @@
+import re
+from dataclasses import dataclass, field
+from typing import Iterator, List
+
+from src import decoders as d
+from src.events import Event, check_text, iter_block_events
+
+_TEXT_FIELDS = re.compile(
+    rb"^[ \t]*(EmitterType|AffectorType|NumEmitters|NumAffectors|length|Name|MeshName|"
+    rb"textureName|textureAnimationName|attachedEmitterName)[ \t]+(.*?)[ \t\r]*$",
+    re.MULTILINE,
+)
+_BOUNDARIES = ("EmitterType", "AffectorType", "NumEmitters", "NumAffectors", "length")
+
+
+@dataclass
+class IndexEntry:
+    kind: str
+    type: str
+    offset: int
+    end: int = 0
+    line_number: int = 1
+    name: str = ""
+    mesh: str = ""
+    texture_animation: str = ""
+    textures: List[str] = field(default_factory=list)
+    attached_emitters: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ParticleIndex:
+    path: str
+    num_emitters: int = 0
+    emitters: List[IndexEntry] = field(default_factory=list)
+    affectors: List[IndexEntry] = field(default_factory=list)
+
+    def read(self, entry: IndexEntry) -> bytes:
+        with open(self.path, "rb") as f:
+            f.seek(entry.offset)
+            return f.read(entry.end - entry.offset)
+
+    def iter_events(self, entry: IndexEntry) -> Iterator[Event]:
+        return iter_block_events(self.read(entry), entry.line_number)
+
+
+def _add_strings(entry: IndexEntry, key: str, value: str) -> None:
+    if key == "Name":
+        entry.name = value
+    elif key == "MeshName":
+        entry.mesh = value
+    elif key == "textureAnimationName":
+        entry.texture_animation = value
+    elif key == "textureName":
+        if value:
+            entry.textures.append(value)
+    elif key == "attachedEmitterName":
+        entry.attached_emitters.append(value)
+
+
+def _scan_text(index: ParticleIndex, data: bytes) -> None:
+    current = None
+    line_number, last = 1, 0
+
+    for match in _TEXT_FIELDS.finditer(data):
+        key = match.group(1).decode("ascii")
+        if key not in _BOUNDARIES:
+            if current:
+                _add_strings(current, key, d.decode_string(match.group(2).decode("utf-8")))
+            continue
+
+        if current:
+            current.end = match.start()
+            current = None
+
+        if key == "NumEmitters":
+            index.num_emitters = d.decode_int(match.group(2).decode("ascii"))
+        elif key in ("EmitterType", "AffectorType"):
+            line_number += data.count(b"\n", last, match.start())
+            last = match.start()
+            current = IndexEntry(
+                key, d.decode_string(match.group(2).decode("utf-8")), match.start()
+            )
+            current.line_number = line_number
+            (index.emitters if key == "EmitterType" else index.affectors).append(current)
+
+    if current:
+        current.end = len(data)
+
+
+def scan_particle(path: str) -> ParticleIndex:
+    with open(path, "rb") as f:
+        data = f.read()
+
+    check_text(data)
+    index = ParticleIndex(path)
+    _scan_text(index, data)
+    return index
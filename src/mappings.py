@@ -0,0 +1,191 @@
+from typing import Any, Callable, Dict, Optional
+
+from src import classes as c
+
+Getter = Callable[[Dict[str, Any]], Any]
+Fields = Dict[str, Getter]
+Converter = Callable[[Any, Dict[str, Any]], None]
+
+_INFLATE_RATES = {"WidthInflateRate", "HeightInflateRate"}
+
+
+def const(value: Any) -> Getter:
+    return lambda contents: value
+
+
+def value(key: str) -> Getter:
+    return lambda contents: contents[key]
+
+
+def uniform(key: str) -> Getter:
+    return lambda contents: c.Vector2f.uniform(contents[key])
+
+
+def span(low: str, high: str) -> Getter:
+    return lambda contents: c.Vector2f(contents[low], contents[high])
+
+
+def ordered_span(low: str, high: str) -> Getter:
+    def get(contents: Dict[str, Any]) -> c.Vector2f:
+        a, b = contents[low], contents[high]
+        return c.Vector2f(a, b) if a <= b else c.Vector2f(b, a)
+
+    return get
+
+
+def vector3(key: str) -> Getter:
+    return lambda contents: c.Vector3f(*contents[key])
+
+
+def optional(key: str, get: Getter) -> Getter:
+    return lambda contents: get(contents) if key in contents else None
+
+
+def flag(key: str) -> Getter:
+    return lambda contents: True if contents[key] else None
+
+
+def inflate_rate(key: str) -> Getter:
+    def get(contents: Dict[str, Any]) -> c.Vector2f:
+        if _INFLATE_RATES <= contents.keys():
+            return c.Vector2f.uniform(contents[key])
+        return c.Vector2f(100, 100)
+
+    return get
+
+
+def push_force(contents: Dict[str, Any]) -> c.ModifierForce:
+    low, high = contents["MinForce"], contents["MaxForce"]
+    if low > high:
+        high, low = low, high
+    return c.ModifierForce(c.Vector2f(low / 25, high / 25), c.ForceType.RANDOM)
+
+
+def spawn_angle_behavior(contents: Dict[str, Any]) -> c.AngleRangeBehavior:
+    if contents["isSpawnAngleRandom"]:
+        return c.AngleRangeBehavior.RANDOM
+    return c.AngleRangeBehavior.SEQUENCE_LOOP
+
+
+def spawn_angle_sequence_size(contents: Dict[str, Any]) -> Optional[int]:
+    if contents["isSpawnAngleRandom"]:
+        return None
+    return contents["nonRandomSpawnLoopEmittedParticleCount"]
+
+
+LINEAR_SPEED = span("ParticleMinStartLinearSpeed", "ParticleMaxStartLinearSpeed")
+
+EMITTER_FIELDS: Dict[c.EmitterType, Fields] = {
+    c.EmitterType.POINT: {
+        "forward_velocity": LINEAR_SPEED,
+    },
+    c.EmitterType.RING: {
+        "radius_x": span("RingRadiusXMin", "RingRadiusXMax"),
+        "radius_y": span("RingRadiusYMin", "RingRadiusYMax"),
+        "angle_range": span("SpawnAngleStart", "SpawnAngleStop"),
+        "tangential_velocity": uniform("ParticleMaxStartSpeedTangential"),
+        "use_edge": const(False),
+        "normal_offset": lambda contents: c.Vector2f(0, 0),
+        "normal_velocity": uniform("ParticleMaxStartSpeedRingNormal"),
+        "radial_velocity": LINEAR_SPEED,
+        "angle_range_behavior": spawn_angle_behavior,
+        "angle_range_sequence_size": spawn_angle_sequence_size,
+    },
+    c.EmitterType.SPHERE: {
+        "radius_x": span("SphereRadiusXMin", "SphereRadiusXMax"),
+        "radius_y": span("SphereRadiusYMin", "SphereRadiusYMax"),
+        "radius_z": span("SphereRadiusZMin", "SphereRadiusZMax"),
+        "azimuthal_tangential_velocity": uniform("ParticleMaxStartSpeedAzimuthalTangential"),
+        "polar_tangential_velocity": uniform("ParticleMaxStartSpeedPolarTangential"),
+        "latitude_angle_range": span("SpawnAngleLatitudinalStart", "SpawnAngleLatitudinalStop"),
+        "longitude_angle_range": span("SpawnAngleLongitudinalStart", "SpawnAngleLongitudinalStop"),
+        "radial_velocity": LINEAR_SPEED,
+        "use_surface": const(False),
+    },
+}
+
+SIZE_CHANGE_RATE: Fields = {
+    "width_change_rate": inflate_rate("WidthInflateRate"),
+    "height_change_rate": inflate_rate("HeightInflateRate"),
+}
+
+PUSH: Fields = {
+    "force": push_force,
+    "op": const(c.Op.TO_POINT_IN_EFFECT_SPACE),
+    "point": optional("Point", vector3("Point")),
+}
+
+MODIFIER_FIELDS: Dict[c.ModifierType, Fields] = {
+    c.ModifierType.DRAG: {
+        "coefficient_generator": lambda contents: c.CoefficientGenerator(
+            range=c.Vector2f.uniform(contents["DragCoefficient"])
+        ),
+    },
+    c.ModifierType.ROTATE_ABOUT_AXIS: {
+        "type": const(c.ModifierType.ROTATE),
+        "axis_of_rotation": vector3("AxisOfRotation"),
+        "op": const(c.Op.AROUND_AXIS),
+        "axis_origin": vector3("AxisOrigin"),
+        "radius": uniform("Radius"),
+        "angular_velocity": uniform("AngularVelocity"),
+    },
+    c.ModifierType.KILL: {
+        "point": vector3("Point"),
+        "op": const(c.Op.NEAR_POINT),
+        "tolerance": uniform("Distance"),
+    },
+    c.ModifierType.COLOR: {
+        "begin_color": value("StartColor"),
+        "end_color": value("EndColor"),
+        "will_oscillate": const(True),
+        "change_duration": uniform("TransitionPeriod"),
+        "change_duration_context": const(c.ChangeDurationContext.PARTICLE_TIME_ELAPSED),
+    },
+    c.ModifierType.SIZE_OSCILLATOR: {
+        "type": const(c.ModifierType.SIZE),
+        "width_stop": ordered_span("BeginSizeX", "EndSizeX"),
+        "height_stop": ordered_span("BeginSizeY", "EndSizeY"),
+        **SIZE_CHANGE_RATE,
+    },
+    c.ModifierType.SIZE: SIZE_CHANGE_RATE,
+    c.ModifierType.LINEAR_BOUNDED_INFLATE: {
+        "type": const(c.ModifierType.SIZE),
+        "width_stop": span("MinWidth", "MaxWidth"),
+        "height_stop": span("MinHeight", "MaxHeight"),
+    },
+    c.ModifierType.LINEAR_FORCE_IN_DIRECTION: {
+        "type": const(c.ModifierType.PUSH),
+        "direction": vector3("Direction"),
+        **PUSH,
+    },
+    c.ModifierType.PUSH: PUSH,
+    c.ModifierType.JITTER: {
+        "type": const(c.ModifierType.PUSH),
+        "force": lambda contents: c.ModifierForce(
+            c.Vector2f.uniform(contents["JitterForce"]), c.ForceType.CONSTANT
+        ),
+        "op": const(c.Op.RANDOM_JITTER),
+        "is_random_jitter_shared": flag("UseCommonForce"),
+    },
+}
+
+
+def compile_fields(fields: Fields) -> Converter:
+    items = tuple(fields.items())
+
+    def convert(target: Any, contents: Dict[str, Any]) -> None:
+        for name, get in items:
+            result = get(contents)
+            if result is not None:
+                setattr(target, name, result)
+
+    return convert
+
+
+EMITTER_CONVERTERS: Dict[c.EmitterType, Converter] = {
+    emitter_type: compile_fields(fields) for emitter_type, fields in EMITTER_FIELDS.items()
+}
+
+MODIFIER_CONVERTERS: Dict[c.ModifierType, Converter] = {
+    modifier_type: compile_fields(fields) for modifier_type, fields in MODIFIER_FIELDS.items()
+}
@@ -0,0 +1,75 @@
+import math
+from typing import Any, Sequence, Tuple
+
+from src.exceptions import ParticleException
+
+Matrix = Sequence[Sequence[float]]
+Euler = Tuple[float, float, float]
+
+
+def _numpy() -> Any:
+    # NumPy is optional and excluded from the exe
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _is_identity(m00: float, m01: float, m02: float, m12: float, m22: float) -> bool:
+    return m00 == 1.0 and m22 == 1.0 and m01 == 0.0 and m02 == 0.0 and m12 == 0.0
+
+
+def euler(orientation: Matrix) -> Euler:
+    m00, m01, m02 = orientation[0]
+    m10, m11, m12 = orientation[1]
+    _, _, m22 = orientation[2]
+
+    if _is_identity(m00, m01, m02, m12, m22):
+        # asin(±0) and atan2(±0, 1) return their signed zero argument
+        return m02, -m12, -m01
+
+    if abs(m02) < 1.0:
+        pitch = math.asin(m02)
+        yaw = math.atan2(-m01, m00)
+        roll = math.atan2(-m12, m22)
+    else:
+        pitch = math.pi / 2 if m02 >= 1.0 else -math.pi / 2
+        yaw = math.atan2(m10, m11)
+        roll = 0
+
+    return pitch, roll, yaw
+
+
+def euler_array(matrices: Any) -> Any:
+    """euler() over an (N, 3, 3) array, for scripts that already hold many orientations.
+
+    Standalone: the converter calls euler() once per emitter on purpose, since a single
+    effect has too few orientations for NumPy to pay off and the exe ships without it.
+    """
+    np = _numpy()
+    if np is None:
+        raise ParticleException("Batched orientation conversion requires NumPy: pip install numpy")
+
+    m = np.asarray(matrices, dtype=np.float64).reshape(-1, 3, 3)
+    m00, m01, m02 = m[:, 0, 0], m[:, 0, 1], m[:, 0, 2]
+    m10, m11, m12 = m[:, 1, 0], m[:, 1, 1], m[:, 1, 2]
+    m22 = m[:, 2, 2]
+
+    result = np.empty((len(m), 3))
+    identity = (m00 == 1.0) & (m22 == 1.0) & (m01 == 0.0) & (m02 == 0.0) & (m12 == 0.0)
+    result[identity, 0] = m02[identity]
+    result[identity, 1] = -m12[identity]
+    result[identity, 2] = -m01[identity]
+
+    regular = ~identity & (np.abs(m02) < 1.0)
+    result[regular, 0] = np.arcsin(m02[regular])
+    result[regular, 1] = np.arctan2(-m12[regular], m22[regular])
+    result[regular, 2] = np.arctan2(-m01[regular], m00[regular])
+
+    locked = ~identity & ~regular
+    result[locked, 0] = np.where(m02[locked] >= 1.0, math.pi / 2, -math.pi / 2)
+    result[locked, 1] = 0.0
+    result[locked, 2] = np.arctan2(m10[locked], m11[locked])
+
+    return result
@@ -0,0 +1,177 @@
+import cProfile
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.fileutil import atomic_open
+
+Function = Tuple[str, int, str]
+
+# spans are always entered, so the disabled path must stay a global lookup and a shared no-op
+_DISABLED = nullcontext()
+_active: Optional["Profiler"] = None
+
+
+@dataclass
+class Phase:
+    seconds: float = 0.0
+    peak_bytes: int = 0
+
+
+@dataclass
+class FileProfile:
+    source: str
+    seconds: float = 0.0
+    phases: Dict[str, Phase] = field(default_factory=dict)
+    stacks: Dict[str, int] = field(default_factory=dict)
+
+
+def span(name: str) -> ContextManager[Any]:
+    if _active is None:
+        return _DISABLED
+    return _active.span(name)
+
+
+class Profiler:
+    def __init__(self, memory: bool = True, stacks: bool = False) -> None:
+        self.memory = memory
+        self.stacks = stacks
+        self.current: Optional[FileProfile] = None
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        if self.memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            phase = self.current.phases.setdefault(name, Phase())  # type: ignore
+            phase.seconds += elapsed
+            if self.memory:
+                phase.peak_bytes = max(phase.peak_bytes, tracemalloc.get_traced_memory()[1])
+
+    @contextmanager
+    def profile(self, source: str) -> Iterator[FileProfile]:
+        global _active
+        self.current = record = FileProfile(source)
+        started_tracing = self.memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        profiler = cProfile.Profile() if self.stacks else None
+
+        _active = self
+        start = time.perf_counter()
+        try:
+            if profiler:
+                profiler.enable()
+            yield record
+        finally:
+            if profiler:
+                profiler.disable()
+            record.seconds = time.perf_counter() - start
+            _active = None
+            self.current = None
+            if started_tracing:
+                tracemalloc.stop()
+            if profiler:
+                record.stacks = collapse(pstats.Stats(profiler).stats)  # type: ignore
+
+
+def _label(function: Function) -> str:
+    file, line, name = function
+    if file == "~":
+        return name
+    return f"{os.path.basename(file)}:{name}:{line}"
+
+
+def collapse(stats: Dict[Function, Any]) -> Dict[str, int]:
+    # cProfile keeps caller edges rather than stacks, so each function's own time is split
+    # across the paths that reach it in proportion to the time spent below each caller
+    children: Dict[Function, List[Tuple[Function, float]]] = defaultdict(list)
+    roots = []
+    for function, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            roots.append(function)
+        for caller, (_, _, _, cumulative) in callers.items():
+            children[caller].append((function, cumulative))
+
+    stacks: Counter = Counter()
+
+    def walk(function: Function, path: Tuple[str, ...], seen: frozenset, scale: float) -> None:
+        _, _, own, cumulative, _ = stats[function]
+        path += (_label(function),)
+        weight = round(own * scale * 1e6)
+        if weight:
+            stacks[";".join(path)] += weight
+        for child, edge in children.get(function, ()):
+            total = stats[child][3]
+            if child in seen or not total or edge * scale < 1e-6:
+                continue
+            walk(child, path, seen | {child}, scale * edge / total)
+
+    for root in roots:
+        walk(root, (), frozenset((root,)), 1.0)
+    return dict(stacks)
+
+
+@dataclass
+class Report:
+    files: List[FileProfile] = field(default_factory=list)
+
+    def add(self, profile: FileProfile) -> None:
+        self.files.append(profile)
+
+    def slowest(self, top: int) -> List[FileProfile]:
+        return sorted(self.files, key=lambda p: p.seconds, reverse=True)[:top]
+
+    def phases(self) -> Dict[str, Phase]:
+        phases: Dict[str, Phase] = {}
+        for profile in self.files:
+            for name, phase in profile.phases.items():
+                total = phases.setdefault(name, Phase())
+                total.seconds += phase.seconds
+                total.peak_bytes = max(total.peak_bytes, phase.peak_bytes)
+        return phases
+
+    def stacks(self) -> Dict[str, int]:
+        stacks: Counter = Counter()
+        for profile in self.files:
+            stacks.update(profile.stacks)
+        return dict(stacks)
+
+    def to_dict(self, top: int = 10) -> Dict[str, Any]:
+        def entry(profile: FileProfile) -> Dict[str, Any]:
+            return {
+                "source": profile.source,
+                "seconds": profile.seconds,
+                "phases": {name: asdict(phase) for name, phase in profile.phases.items()},
+            }
+
+        return {
+            "files": len(self.files),
+            "seconds": sum(p.seconds for p in self.files),
+            "phases": {name: asdict(phase) for name, phase in self.phases().items()},
+            "slowest": [entry(p) for p in self.slowest(top)],
+            "per_file": [entry(p) for p in self.files],
+        }
+
+    def save(self, path: str, top: int = 10) -> None:
+        with atomic_open(path, "w") as f:
+            json.dump(self.to_dict(top), f, indent=2)
+
+    def save_stacks(self, path: str) -> None:
+        with atomic_open(path, "w") as f:
+            for stack, weight in sorted(self.stacks().items()):
+                f.write(f"{stack} {weight}\n")
+
+
+def report(profiles: Iterable[FileProfile]) -> Report:
+    return Report(list(profiles))
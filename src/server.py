@@ -0,0 +1,282 @@
+import hashlib
+import io
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from src.converter import Logger, SinsParticle
+
+HOST = "127.0.0.1"
+MAX_BODY = 16 * 1024 * 1024
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FORMATS = {"particle": ".particle", "texanim": ".texanim"}
+PATHS = ("/convert", "/metrics", "/health")
+_COLORS = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def convert(data: bytes, extension: str, compact: bool) -> Tuple[Optional[str], str]:
+    with io.StringIO() as buf, redirect_stdout(buf):
+        particle = SinsParticle.from_bytes(data, "request" + extension).parse()
+        return (particle.dumps(compact) if particle.file else None), buf.getvalue()
+
+
+def _warm() -> None:
+    pass
+
+
+class ResultCache:
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self.lock:
+            output = self.entries.get(key)
+            if output is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return output
+
+    def put(self, key: str, output: bytes) -> None:
+        if len(output) > self.max_size:
+            return
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self.entries[key] = output
+            self.size += len(output)
+            while self.size > self.max_size:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.requests: Dict[Tuple[str, int], int] = {}
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, path: str, status: int, seconds: float) -> None:
+        path = path if path in PATHS else "other"
+        with self.lock:
+            self.requests[path, status] = self.requests.get((path, status), 0) + 1
+            if path != "/convert":
+                return
+            self.count += 1
+            self.total += seconds
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    self.buckets[i] += 1
+
+    def render(self, cache: ResultCache) -> str:
+        lines: List[str] = ["# TYPE particle_converter_requests_total counter"]
+        with self.lock:
+            for (path, status), count in sorted(self.requests.items()):
+                lines.append(
+                    f'particle_converter_requests_total{{path="{path}",status="{status}"}} {count}'
+                )
+            lines.append("# TYPE particle_converter_convert_seconds histogram")
+            for bound, count in zip(BUCKETS, self.buckets):
+                lines.append(f'particle_converter_convert_seconds_bucket{{le="{bound}"}} {count}')
+            lines.append(f'particle_converter_convert_seconds_bucket{{le="+Inf"}} {self.count}')
+            lines.append(f"particle_converter_convert_seconds_sum {self.total}")
+            lines.append(f"particle_converter_convert_seconds_count {self.count}")
+
+        lookups = cache.hits + cache.misses
+        lines += [
+            "# TYPE particle_converter_cache_hits_total counter",
+            f"particle_converter_cache_hits_total {cache.hits}",
+            "# TYPE particle_converter_cache_misses_total counter",
+            f"particle_converter_cache_misses_total {cache.misses}",
+            "# TYPE particle_converter_cache_hit_ratio gauge",
+            f"particle_converter_cache_hit_ratio {cache.hits / lookups if lookups else 0.0}",
+            "# TYPE particle_converter_cache_bytes gauge",
+            f"particle_converter_cache_bytes {cache.size}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class ConversionService:
+    def __init__(
+        self,
+        workers: int = 1,
+        cache_size: int = 64 * 1024 * 1024,
+        timeout: float = 30.0,
+        max_pending: Optional[int] = None,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.cache = ResultCache(cache_size)
+        self.metrics = Metrics()
+        self.slots = threading.BoundedSemaphore(max_pending or self.workers * 4)
+        self.lock = threading.Lock()
+        self.executor = self._start()
+
+    def _start(self) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        # import the converter in every worker up front instead of on the first request
+        for future in [executor.submit(_warm) for _ in range(self.workers)]:
+            future.result()
+        return executor
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        with self.lock:
+            if self.executor is broken:
+                # shutdown() leaves a running conversion alone, so kill the workers outright
+                processes = list(broken._processes.values())  # type: ignore
+                # queued bodies may still be stuck in the pipe to the dead workers, don't wait on it
+                broken._call_queue.cancel_join_thread()  # type: ignore
+                broken.shutdown(wait=False)
+                for process in processes:
+                    process.kill()
+                self.executor = self._start()
+
+    def convert(self, data: bytes, extension: str, compact: bool) -> Tuple[int, bytes, str]:
+        key = hashlib.sha256(f"{extension}\0{compact}\0".encode("utf-8") + data).hexdigest()
+        output = self.cache.get(key)
+        if output is not None:
+            return 200, output, "hit"
+
+        if not self.slots.acquire(timeout=self.timeout):
+            return 503, b"Too many pending conversions\n", "miss"
+        try:
+            executor = self.executor
+            try:
+                result, log = executor.submit(convert, data, extension, compact).result(
+                    self.timeout
+                )
+            except FutureTimeout:
+                # the worker is still busy with it, recycle the pool so it can't hold a slot
+                self._restart(executor)
+                return 504, b"Conversion timed out\n", "miss"
+            except BrokenProcessPool:
+                if self.executor is executor:
+                    self._restart(executor)
+                    return 500, b"Conversion worker crashed\n", "miss"
+                return 503, b"Conversion workers restarted, try again\n", "miss"
+        finally:
+            self.slots.release()
+
+        if result is None:
+            return 422, _COLORS.sub("", log).encode("utf-8"), "miss"
+        output = result.encode("utf-8")
+        self.cache.put(key, output)
+        return 200, output, "miss"
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class Handler(BaseHTTPRequestHandler):
+    server: "ConversionServer"
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        self.timeout = self.server.service.timeout  # type: ignore
+        super().setup()
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str, **headers: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name.replace("_", "-"), value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        start = time.perf_counter()
+        path = urlparse(self.path).path
+        service = self.server.service
+        if path == "/metrics":
+            status = 200
+            self._send(status, service.metrics.render(service.cache).encode(), "text/plain")
+        elif path == "/health":
+            status = 200
+            self._send(status, b"ok\n", "text/plain")
+        else:
+            status = 404
+            self._send(status, b"Not found\n", "text/plain")
+        service.metrics.observe(path, status, time.perf_counter() - start)
+
+    def do_POST(self) -> None:
+        start = time.perf_counter()
+        url = urlparse(self.path)
+        service = self.server.service
+        query = parse_qs(url.query)
+
+        extension = FORMATS.get(query.get("format", ["particle"])[0])
+        header = self.headers.get("Content-Length")
+        length = int(header) if header is not None and header.strip().isdigit() else -1
+        data = None
+        if url.path != "/convert":
+            status, body, cache = 404, b"Not found\n", "miss"
+        elif header is None:
+            status, body, cache = 411, b"Content-Length required\n", "miss"
+        elif length < 0:
+            status, body, cache = 400, b"Invalid Content-Length\n", "miss"
+        elif extension is None:
+            status, body, cache = 400, b"format must be particle or texanim\n", "miss"
+        elif length > MAX_BODY:
+            status, body, cache = 413, b"Request body too large\n", "miss"
+        else:
+            data = self.rfile.read(length)
+            compact = query.get("compact", ["0"])[0] not in ("0", "false", "")
+            status, body, cache = service.convert(data, extension, compact)
+
+        if data is None:
+            # an unread body would be parsed as the next request on this connection
+            self.close_connection = True
+        content_type = "application/json" if status == 200 else "text/plain"
+        self._send(status, body, content_type, X_Cache=cache)
+        service.metrics.observe(url.path, status, time.perf_counter() - start)
+
+
+class ConversionServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int, service: ConversionService) -> None:
+        self.service = service
+        super().__init__((HOST, port), Handler)
+
+
+def serve(
+    port: int,
+    workers: int = 1,
+    cache_size: int = 64 * 1024 * 1024,
+    timeout: float = 30.0,
+) -> None:
+    service = ConversionService(workers, cache_size, timeout)
+    server = ConversionServer(port, service)
+    Logger.info(
+        f"Serving on http://{HOST}:{server.server_address[1]} with {service.workers} workers, "
+        "press Ctrl+C to stop"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        Logger.info(f"{service.cache.hits} cache hits, {service.cache.misses} misses")
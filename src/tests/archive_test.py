@@ -0,0 +1,94 @@
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+from contextlib import redirect_stdout
+from typing import Optional
+
+from src import archive, batch
+from src.cache import ConversionCache
+from src.deps import DependencyIndex
+
+
+class TestArchive(unittest.TestCase):
+    def setUp(self) -> None:
+        curr_path = os.path.dirname(os.path.abspath(__file__))
+        self.particles_path = os.path.join(curr_path, "particles/")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.out = os.path.join(self.tmp.name, "out")
+
+        self.names = sorted(os.listdir(self.particles_path))[:3]
+        self.members = [
+            f"Particle/b/{self.names[0]}",
+            f"Particle/a/{self.names[1]}",
+            f"../../{self.names[2]}",
+            "readme.txt",
+        ]
+        self.zip = os.path.join(self.tmp.name, "mod.zip")
+        with zipfile.ZipFile(self.zip, "w", zipfile.ZIP_DEFLATED) as z:
+            for member, name in zip(self.members, self.names):
+                z.write(os.path.join(self.particles_path, name), member)
+            z.writestr("readme.txt", "skipped")
+            z.writestr("Particle/broken.particle", "TXT\nbroken\n")
+
+    def convert(self, workers: int, cache: Optional[ConversionCache] = None) -> batch.Summary:
+        with io.StringIO() as buf, redirect_stdout(buf):
+            return batch.convert([self.zip], self.out, cache, workers=workers)
+
+    def test_jobs(self) -> None:
+        jobs = list(batch.iter_jobs([self.zip], self.out))
+        self.assertEqual(
+            [job.member for job in jobs], self.members[:3] + ["Particle/broken.particle"]
+        )
+        self.assertTrue(all(job.source == self.zip for job in jobs))
+
+        effects = os.path.join(self.out, "effects")
+        for job in jobs:
+            self.assertTrue(job.target.startswith(effects + os.sep), job.target)
+        self.assertEqual(
+            os.path.relpath(jobs[0].target, effects),
+            os.path.join("Particle", "b", self.names[0].split(".")[0] + ".particle_effect"),
+        )
+        self.assertEqual(os.path.dirname(jobs[2].target), effects)
+        self.assertEqual(archive.member_dir("a\\..\\b/c.particle"), os.path.join("a", "b"))
+
+    def test_matches_files(self) -> None:
+        files = [os.path.join(self.particles_path, name) for name in self.names]
+        with io.StringIO() as buf, redirect_stdout(buf):
+            batch.convert(files, self.tmp.name)
+        expected = {}
+        for member, name in zip(self.members, self.names):
+            with open(os.path.join(self.tmp.name, "effects", name + "_effect")) as f:
+                expected[member] = f.read()
+
+        for workers in (1, 2):
+            summary = self.convert(workers)
+            self.assertEqual((summary.converted, len(summary.failed)), (3, 1))
+            self.assertEqual(summary.failed[0].job.path, f"{self.zip}/Particle/broken.particle")
+
+            for job in batch.iter_jobs([self.zip], self.out):
+                if job.member in expected:
+                    with open(job.target) as f:
+                        self.assertEqual(f.read(), expected[job.member])
+
+    def test_closed_after_run(self) -> None:
+        handle = archive._archive(self.zip)
+        self.assertIs(archive._archive(self.zip), handle)
+        index = DependencyIndex(os.path.join(self.tmp.name, "deps.json"))
+        with io.StringIO() as buf, redirect_stdout(buf):
+            batch.convert([self.zip], self.out, index=index)
+        # the package stays deletable between runs of the resident converter
+        self.assertEqual(archive._archives, {})
+        self.assertIsNone(handle.fp)
+
+    def test_cache(self) -> None:
+        cache = ConversionCache(os.path.join(self.tmp.name, "cache"), "test")
+        self.assertEqual(self.convert(1, cache).converted, 3)
+        summary = self.convert(2, cache)
+        self.assertEqual((summary.converted, summary.cached), (0, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
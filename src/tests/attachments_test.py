@@ -0,0 +1,63 @@
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+
+from src.converter import SinsParticle
+
+
+class TestAttachments(unittest.TestCase):
+    def setUp(self) -> None:
+        curr_path = os.path.dirname(os.path.abspath(__file__))
+        self.particles_path = os.path.join(curr_path, "particles/")
+
+    def parse(self, name: str) -> SinsParticle:
+        with io.StringIO() as buf, redirect_stdout(buf):
+            particle = SinsParticle(os.path.join(self.particles_path, name)).parse()
+            self.log = buf.getvalue()
+        return particle
+
+    def test_attachments(self) -> None:
+        particle = self.parse("TitanAbility_NanoLeech_Self.particle")
+        simulation = particle.collector["ParticleSimulation"]
+
+        expected = []
+        for attacher_id, affector in enumerate(simulation["Affectors"]):
+            if affector["AffectorType"] == "Fade":
+                continue
+            for attached in affector["AffectorContents"].get("AttachedEmitters", []):
+                for attachee_id, emitter in enumerate(simulation["Emitters"]):
+                    if emitter["EmitterContents"]["Name"] == attached:
+                        expected.append((attacher_id, attachee_id))
+
+        self.assertEqual(
+            [(a.attacher_id, a.attachee_id) for a in particle.modifier_to_emitter_attachments],
+            expected,
+        )
+        for name, emitter_ids in particle.emitter_ids.items():
+            for emitter_id in emitter_ids:
+                self.assertEqual(
+                    simulation["Emitters"][emitter_id]["EmitterContents"]["Name"], name
+                )
+
+    def test_fade_values(self) -> None:
+        particle = self.parse("TitanAbility_NanoLeech_Self.particle")
+        for emitter in particle.emitters:
+            fades = particle.fade_values.get(emitter.name, [])
+            fade_in = [f["fade_in_time"] for f in fades if f["do_fade_in"]]
+            fade_out = [f["fade_out_time"] for f in fades if f["do_fade_out"]]
+            if fade_in:
+                self.assertEqual(emitter.particle.fade_in_time.min, fade_in[-1])  # type: ignore
+            if fade_out:
+                self.assertEqual(emitter.particle.fade_out_time.min, fade_out[-1])  # type: ignore
+
+    def test_duplicate_names_are_reported(self) -> None:
+        particle = self.parse("Ability_StunBurstActivate.particle")
+        self.assertEqual(particle.emitter_ids["Sphere"], [0, 1])
+        self.assertIn("'Sphere', which names emitters [0, 1]", self.log)
+        attachees = {a.attachee_id for a in particle.modifier_to_emitter_attachments}
+        self.assertLessEqual({0, 1}, attachees)
+
+
+if __name__ == "__main__":
+    unittest.main()
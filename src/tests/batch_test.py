@@ -0,0 +1,101 @@
+import io
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from src import batch
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        curr_path = os.path.dirname(os.path.abspath(__file__))
+        self.particles_path = os.path.join(curr_path, "particles/")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.source = os.path.join(self.tmp.name, "mod")
+        self.out = os.path.join(self.tmp.name, "out")
+        names = sorted(os.listdir(self.particles_path))
+        for sub, name in (("", names[0]), ("a", names[1]), (os.path.join("a", "b"), names[2])):
+            os.makedirs(os.path.join(self.source, sub), exist_ok=True)
+            shutil.copy(os.path.join(self.particles_path, name), os.path.join(self.source, sub))
+        with open(os.path.join(self.source, "a", "broken.particle"), "w") as f:
+            f.write("TXT\nbroken\n")
+        with open(os.path.join(self.source, "a", "readme.txt"), "w") as f:
+            f.write("skipped")
+        self.names = names
+
+    def convert(self, workers: int) -> batch.Summary:
+        with io.StringIO() as buf, redirect_stdout(buf):
+            return batch.convert([self.source], self.out, workers=workers)
+
+    def test_mirrors_tree(self) -> None:
+        jobs = list(batch.iter_jobs([self.source], self.out))
+        self.assertEqual(len(jobs), 4)
+
+        summary = self.convert(1)
+        self.assertEqual((summary.converted, summary.cached, len(summary.failed)), (3, 0, 1))
+        self.assertTrue(summary.failed[0].job.source.endswith("broken.particle"))
+        self.assertIn("[ERROR]", summary.failed[0].log)
+
+        effects = os.path.join(self.out, "effects")
+        for sub, name in (("", self.names[0]), ("a", self.names[1]), ("a/b", self.names[2])):
+            target = os.path.join(effects, sub, name.split(".")[0] + ".particle_effect")
+            self.assertTrue(os.path.isfile(target), target)
+        self.assertFalse(os.path.exists(os.path.join(effects, "a", "broken.particle_effect")))
+
+    def test_workers_match(self) -> None:
+        self.convert(1)
+        expected = {}
+        for root, _, files in os.walk(self.out):
+            for file in files:
+                with open(os.path.join(root, file), "rb") as f:
+                    expected[os.path.relpath(os.path.join(root, file), self.out)] = f.read()
+        shutil.rmtree(self.out)
+
+        summary = self.convert(2)
+        self.assertEqual((summary.converted, len(summary.failed)), (3, 1))
+        for path, data in expected.items():
+            with open(os.path.join(self.out, path), "rb") as f:
+                self.assertEqual(f.read(), data)
+
+    @unittest.skipIf(os.name == "nt", "POSIX permissions")
+    def test_output_mode(self) -> None:
+        umask = os.umask(0)
+        os.umask(umask)
+        summary = self.convert(1)
+        for target in summary.outputs:
+            self.assertEqual(stat.S_IMODE(os.stat(target).st_mode), 0o666 & ~umask, target)
+
+        os.chmod(summary.outputs[0], 0o640)
+        with open(summary.outputs[0], "a") as f:
+            f.write(" ")
+        self.convert(1)
+        self.assertEqual(stat.S_IMODE(os.stat(summary.outputs[0]).st_mode), 0o640)
+
+    def test_write_if_changed(self) -> None:
+        summary = self.convert(1)
+        self.assertEqual((summary.written, summary.unchanged), (3, 0))
+        mtimes = {target: os.stat(target).st_mtime_ns for target in summary.outputs}
+
+        stale = summary.outputs[0]
+        with open(stale, "r+") as f:
+            f.write(" ")
+        for target in summary.outputs[1:]:
+            os.utime(target, ns=(0, 0))
+
+        summary = self.convert(2)
+        self.assertEqual((summary.written, summary.unchanged, len(summary.failed)), (1, 2, 1))
+        self.assertNotEqual(os.stat(stale).st_mtime_ns, mtimes[stale])
+        for target in summary.outputs[1:]:
+            self.assertEqual(os.stat(target).st_mtime_ns, 0)
+
+        with open(stale) as f:
+            self.assertFalse(f.read().startswith(" "))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from src.converter import SinsParticle
+from src.events import iter_events
+from src.exceptions import SinsParticleException
+from src.index import scan_particle
+
+
+class TestBinary(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.data = b"BIN\x01\x00\x00\x00" + bytes(64)
+
+    def test_refused(self) -> None:
+        for name in ("effect.particle", "smoke.texanim"):
+            path = os.path.join(self.tmp.name, name)
+            with open(path, "wb") as f:
+                f.write(self.data)
+            with io.StringIO() as buf, redirect_stdout(buf):
+                particle = SinsParticle(particle_path=path).parse()
+                self.assertIn("Convert it to TXT format", buf.getvalue())
+            self.assertIsNone(particle.file)
+            with self.assertRaises(SinsParticleException):
+                scan_particle(path)
+
+    def test_refused_stream(self) -> None:
+        for source in (self.data, io.BytesIO(self.data)):
+            with self.assertRaises(SinsParticleException):
+                list(iter_events(source))
+
+
+if __name__ == "__main__":
+    unittest.main()
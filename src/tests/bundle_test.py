@@ -0,0 +1,129 @@
+import io
+import os
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from contextlib import redirect_stdout
+from typing import Dict
+
+from src import batch
+from src.bundle import Bundle
+
+TEXANIM = (
+    "TXT\n"
+    'textureFileName "Smoke.tga"\n'
+    "numFrames 16\n"
+    "numFramesPerRow 4\n"
+    "startTopLeft [ 0 0 ]\n"
+    "frameSize [ 64 64 ]\n"
+    "frameStride [ 64 64 ]\n"
+)
+
+
+class TestBundle(unittest.TestCase):
+    def setUp(self) -> None:
+        curr_path = os.path.dirname(os.path.abspath(__file__))
+        self.particles_path = os.path.join(curr_path, "particles/")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.source = os.path.join(self.tmp.name, "source")
+        os.makedirs(os.path.join(self.source, "nested"))
+        for name in sorted(os.listdir(self.particles_path))[:3]:
+            with open(os.path.join(self.particles_path, name), "rb") as src:
+                with open(os.path.join(self.source, "nested", name), "wb") as dst:
+                    dst.write(src.read())
+        with open(os.path.join(self.source, "smoke.texanim"), "w") as f:
+            f.write(TEXANIM)
+
+    def convert(self, path: str, workers: int = 1) -> batch.Summary:
+        bundle = Bundle(path)
+        out = os.path.join(self.tmp.name, "unused")
+        with io.StringIO() as buf, redirect_stdout(buf):
+            summary = batch.convert([self.source], out, workers=workers, bundle=bundle)
+        bundle.close()
+        self.assertFalse(os.path.exists(out))
+        return summary
+
+    def loose(self) -> Dict[str, bytes]:
+        out = os.path.join(self.tmp.name, "loose")
+        with io.StringIO() as buf, redirect_stdout(buf):
+            summary = batch.convert([self.source], out)
+        files = {}
+        for target in summary.outputs:
+            with open(target, "rb") as f:
+                files[os.path.relpath(target, out).replace(os.sep, "/")] = f.read()
+        return files
+
+    def test_zip(self) -> None:
+        path = os.path.join(self.tmp.name, "out.zip")
+        summary = self.convert(path)
+        self.assertEqual(summary.converted, 4)
+        with zipfile.ZipFile(path) as z:
+            names = z.namelist()
+            files = {name: z.read(name) for name in names}
+            self.assertEqual({info.date_time for info in z.infolist()}, {(1980, 1, 1, 0, 0, 0)})
+
+        out = os.path.join(self.tmp.name, "unused")
+        self.assertEqual(
+            names, [os.path.relpath(target, out).replace(os.sep, "/") for target in summary.outputs]
+        )
+        self.assertIn("texture_animations/smoke.texture_animation", names)
+        self.assertTrue(any(name.startswith("effects/nested/") for name in names), names)
+        self.assertEqual(files, self.loose())
+
+    def test_tar(self) -> None:
+        for extension in (".tar", ".tar.gz", ".tar.xz"):
+            path = os.path.join(self.tmp.name, "out" + extension)
+            self.convert(path)
+            with tarfile.open(path) as tar:
+                files = {}
+                for info in tar.getmembers():
+                    self.assertEqual((info.mode, info.uid, info.uname), (0o644, 0, ""))
+                    files[info.name] = tar.extractfile(info).read()  # type: ignore
+            self.assertEqual(files, self.loose(), extension)
+
+    def test_deterministic(self) -> None:
+        for extension in (".zip", ".tar.gz"):
+            first = os.path.join(self.tmp.name, "first" + extension)
+            second = os.path.join(self.tmp.name, "second" + extension)
+            self.convert(first)
+            self.convert(second, workers=2)
+            with open(first, "rb") as a, open(second, "rb") as b:
+                self.assertEqual(a.read(), b.read(), extension)
+
+    def test_unchanged(self) -> None:
+        path = os.path.join(self.tmp.name, "out.tar.xz")
+        self.convert(path)
+        os.utime(path, ns=(0, 0))
+
+        bundle = Bundle(path)
+        with io.StringIO() as buf, redirect_stdout(buf):
+            batch.convert([self.source], self.tmp.name, bundle=bundle)
+        self.assertFalse(bundle.close())
+        self.assertEqual(os.stat(path).st_mtime_ns, 0)
+
+        bundle = Bundle(path)
+        bundle.add("effects/a.particle_effect", b"{}")
+        try:
+            raise RuntimeError
+        except RuntimeError:
+            bundle.discard()
+        self.assertEqual(os.stat(path).st_mtime_ns, 0)
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["out.tar.xz", "source"])
+
+    def test_level(self) -> None:
+        stored = os.path.join(self.tmp.name, "stored.zip")
+        bundle = Bundle(stored, level=0)
+        bundle.add("effects/a.particle_effect", b"{}" * 1000)
+        bundle.close()
+        with zipfile.ZipFile(stored) as z:
+            self.assertEqual(z.getinfo("effects/a.particle_effect").compress_type, 0)
+
+        with self.assertRaises(ValueError):
+            Bundle(os.path.join(self.tmp.name, "out.rar"))
+
+
+if __name__ == "__main__":
+    unittest.main()
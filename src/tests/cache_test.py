@@ -0,0 +1,74 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+
+from src.cache import ConversionCache
+from src.converter import convert_file
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self) -> None:
+        curr_path = os.path.dirname(os.path.abspath(__file__))
+        self.particles_path = os.path.join(curr_path, "particles/")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_key(self) -> None:
+        cache = ConversionCache(self.tmp.name, "1.0.0")
+        key = cache.key(b"data", ".particle_effect")
+        self.assertEqual(key, cache.key(b"data", ".particle_effect"))
+        self.assertNotEqual(key, cache.key(b"other", ".particle_effect"))
+        self.assertNotEqual(key, cache.key(b"data", ".texture_animation"))
+        self.assertNotEqual(
+            key, ConversionCache(self.tmp.name, "1.0.1").key(b"data", ".particle_effect")
+        )
+        self.assertNotEqual(
+            key,
+            ConversionCache(self.tmp.name, "1.0.0", {"compact": True}).key(
+                b"data", ".particle_effect"
+            ),
+        )
+
+    def test_hit_and_miss(self) -> None:
+        cache = ConversionCache(self.tmp.name, "1.0.0")
+        key = cache.key(b"data", ".particle_effect")
+        self.assertIsNone(cache.get(key))
+        cache.put(key, b"output")
+        self.assertEqual(cache.get(key), b"output")
+
+    def test_evict(self) -> None:
+        cache = ConversionCache(self.tmp.name, "1.0.0", max_size=10)
+        keys = [cache.key(bytes([i]), ".particle_effect") for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, b"12345")
+            path = os.path.join(self.tmp.name, key[:2], key)
+            os.utime(path, (time.time() + i, time.time() + i))
+
+        self.assertEqual(cache.evict(), 1)
+        self.assertIsNone(cache.get(keys[0]))
+        self.assertIsNotNone(cache.get(keys[2]))
+
+        cache.max_size, cache.max_age = None, -1
+        self.assertEqual(cache.evict(), 2)
+
+    def test_convert_file(self) -> None:
+        path = os.path.join(self.particles_path, sorted(os.listdir(self.particles_path))[0])
+        cache = ConversionCache(os.path.join(self.tmp.name, "cache"), "1.0.0")
+        save_path = os.path.join(self.tmp.name, "out.particle_effect")
+
+        with io.StringIO() as buf, redirect_stdout(buf):
+            self.assertEqual(convert_file(path, save_path, cache), "converted")
+            with open(save_path, "rb") as f:
+                expected = f.read()
+            os.remove(save_path)
+            self.assertEqual(convert_file(path, save_path, cache), "cached")
+
+        with open(save_path, "rb") as f:
+            self.assertEqual(f.read(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
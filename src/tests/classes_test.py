@@ -0,0 +1,77 @@
+import dataclasses
+import pickle
+import unittest
+
+from src import classes as c
+
+
+class TestSerialize(unittest.TestCase):
+    def test_modifier(self) -> None:
+        modifier = c.Modifier(
+            id=1,
+            name="Drag",
+            type=c.ModifierType.DRAG,
+            coefficient_generator=c.CoefficientGenerator(range=c.Vector2f(1, 2)),
+            point=c.Vector3f(1, 2, 3),
+        )
+        self.assertEqual(
+            c.serialize(modifier),
+            {
+                "id": 1,
+                "name": "Drag",
+                "type": "drag",
+                "coefficient_generator": {"type": "constant", "range": [1.0, 2.0]},
+                "point": [1.0, 2.0, 3.0],
+            },
+        )
+
+    def test_containers(self) -> None:
+        self.assertEqual(
+            c.serialize({"a": [c.Attacher(0, 1), c.Op.NEAR_POINT, None, "x"]}),
+            {"a": [{"attacher_id": 0, "attachee_id": 1}, "near_point", None, "x"]},
+        )
+
+    def test_cached(self) -> None:
+        c.serialize(c.EmitRate())
+        serializer = c._SERIALIZERS[c.EmitRate]
+        c.serialize(c.EmitRate(primary_emit_rate=c.Vector2f(1, 1)))
+        self.assertIs(c._SERIALIZERS[c.EmitRate], serializer)
+
+
+class TestModels(unittest.TestCase):
+    def test_vectors_are_interned(self) -> None:
+        self.assertIs(c.Vector2f(0.5, 1.5), c.Vector2f(0.5, 1.5))
+        self.assertIs(c.Vector3f(1.0, 0.0, 2.0), c.Vector3f(1.0, 0.0, 2.0))
+        self.assertIsNot(c.Vector2f(0.0, 1.0), c.Vector2f(-0.0, 1.0))
+        self.assertEqual(c.serialize(c.Vector2f(-0.0, 0.0)), [-0.0, 0.0])
+        self.assertEqual(repr(c.serialize(c.Vector2f(-0.0, 0.0))), "[-0.0, 0.0]")
+
+        self.assertIs(type(c.Vector2f(1.0, 2.0).min), float)
+        self.assertIs(type(c.Vector2f(1, 2).min), int)
+        self.assertIs(type(c.Vector3f(True, 1, 1.0).x), bool)
+        self.assertIs(type(c.Vector3f(1.0, 1.0, 1.0).x), float)
+
+        size = len(c._INTERNED)
+        nan = float("nan")
+        c.Vector2f(nan, 1.0)
+        c.Vector3f(1.0, nan, 1.0)
+        self.assertEqual(len(c._INTERNED), size)
+
+    def test_vectors_are_immutable(self) -> None:
+        vector = c.Vector2f(1, 2)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            vector.min = 3  # type: ignore
+        self.assertEqual(pickle.loads(pickle.dumps(vector)), vector)
+        self.assertEqual(c.Vector2f.uniform(2.0), c.Vector2f(2.0, 2.0))
+
+    def test_slots(self) -> None:
+        billboard = c.Billboard(uber_constants=c.UberConstants(basic_constants=c.BasicConstants()))
+        self.assertFalse(hasattr(billboard, "__dict__"))
+        billboard["texture_0"] = "a_clr"
+        billboard["unknown"] = "ignored"
+        self.assertEqual(billboard["texture_0"], "a_clr")
+        self.assertIsNone(billboard["unknown"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from src import columnar
+from src.exceptions import ParticleException
+
+
+@unittest.skipIf(columnar.np is None, "NumPy is not installed")
+class TestColumnar(unittest.TestCase):
+    def setUp(self) -> None:
+        curr_path = os.path.dirname(os.path.abspath(__file__))
+        self.particles_path = os.path.join(curr_path, "particles/")
+        names = sorted(os.listdir(self.particles_path))[::40]
+        self.corpus = columnar.load([os.path.join(self.particles_path, n) for n in names])
+
+    def test_columns(self) -> None:
+        emitters = self.corpus.emitters
+        self.assertEqual(len(emitters["file"]), len(emitters))
+        self.assertEqual(emitters["particle.billboard.width"].shape, (len(emitters), 2))
+
+        for i in range(len(emitters)):
+            document = self.corpus.documents[emitters["file"][i]]
+            emitter = document["emitters"][emitters["emitter"][i]]
+            self.assertEqual(emitter["name"], emitters["name"][i])
+            self.assertEqual(
+                emitter["emit_rate"]["primary_emit_rate"][0],
+                emitters["emit_rate.primary_emit_rate"][i, 0],
+            )
+
+        modifiers = self.corpus.modifiers
+        self.assertEqual(len(modifiers), sum(len(d["modifiers"]) for d in self.corpus.documents))
+
+    def test_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            saved = self.corpus.save(tmp)
+            reloaded = columnar.load([tmp])
+            self.assertEqual(len(saved), len(reloaded.files))
+            for path in saved:
+                with open(path) as f:
+                    self.assertIn(json.load(f), self.corpus.documents)
+
+    def test_save_layout(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            source, out = os.path.join(tmp, "source"), os.path.join(tmp, "out")
+            path = self.corpus.files[0]
+            for name in ("a/effect.particle", "b/effect.particle", "effect.v2.particle"):
+                os.makedirs(os.path.dirname(os.path.join(source, name)), exist_ok=True)
+                shutil.copy(path, os.path.join(source, name))
+
+            saved = columnar.load([source]).save(out)
+            self.assertEqual(
+                sorted(os.path.relpath(target, out).replace(os.sep, "/") for target in saved),
+                [
+                    "a/effect.particle_effect",
+                    "b/effect.particle_effect",
+                    "effect.v2.particle_effect",
+                ],
+            )
+
+            corpus = columnar.load([os.path.join(source, "a"), os.path.join(source, "b")])
+            with self.assertRaises(ParticleException):
+                corpus.save(out)
+
+    def test_bulk_edit(self) -> None:
+        emitters = self.corpus.emitters
+        rings = emitters["type"] == "ring"
+        self.assertTrue(rings.any())
+        expected = emitters["radius_x"][rings] * 1.2
+
+        emitters["radius_x"][rings] *= 1.2
+        self.corpus.store()
+
+        ring_rows = [row for row, ring in zip(emitters.rows, rings) if ring]
+        for row, radius in zip(ring_rows, expected):
+            self.assertEqual(row["radius_x"], list(radius))
+        points = emitters["type"] == "point"
+        self.assertNotIn("radius_x", emitters.rows[int(points.argmax())])
+
+
+class TestOptional(unittest.TestCase):
+    def test_requires_numpy(self) -> None:
+        if columnar.np is None:
+            with self.assertRaises(ParticleException):
+                columnar.load([])
+        else:
+            self.assertEqual(len(columnar.load([]).emitters), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
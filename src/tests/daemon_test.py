@@ -0,0 +1,111 @@
+import argparse
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from typing import List, Optional
+from unittest import mock
+
+from particle_converter import parse_args, run
+from src import daemon
+from src.fileutil import atomic_write
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self) -> None:
+        curr_path = os.path.dirname(os.path.abspath(__file__))
+        self.particles_path = os.path.join(curr_path, "particles/")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        state = os.path.join(self.tmp.name, "state.json")
+        patcher = mock.patch.object(daemon, "state_path", lambda: state)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def start(self, idle_timeout: float = 1, run: daemon.Run = run) -> daemon.DaemonServer:
+        server = daemon.DaemonServer(idle_timeout, parse_args, run)
+        state = {"port": server.server_address[1], "token": server.token}
+        atomic_write(daemon.state_path(), json.dumps(state), permissions=0o600)
+
+        def serve() -> None:
+            while not server.stopped:
+                server.handle_request()
+            server.server_close()
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 10)
+        self.addCleanup(setattr, server, "stopped", True)
+        return server
+
+    def test_forwardable(self) -> None:
+        self.assertTrue(daemon.forwardable(["a.particle", "--out", "out", "-j", "2"]))
+        for argv in ([], ["-"], ["--watch", "dir"], ["--serve=8000"], ["--no-daemon", "a"]):
+            self.assertFalse(daemon.forwardable(argv), argv)
+
+    def test_no_daemon(self) -> None:
+        self.assertIsNone(daemon.forward(["a.particle"]))
+
+    def test_forward(self) -> None:
+        self.start()
+        out = os.path.join(self.tmp.name, "out")
+        source = os.path.join(self.particles_path, "simple.particle")
+
+        with io.StringIO() as buf, redirect_stdout(buf):
+            code = daemon.forward(["--out", out, "--no-cache", source])
+            log = buf.getvalue()
+        self.assertEqual(code, 0)
+        self.assertIn("1 converted", log)
+        self.assertIn("Finished", log)
+        self.assertTrue(os.path.isfile(os.path.join(out, "effects", "simple.particle_effect")))
+
+        with io.StringIO() as buf, redirect_stdout(buf):
+            self.assertEqual(daemon.forward(["--out", out, "--no-cache", "missing.particle"]), 1)
+            self.assertIsNone(daemon.forward(["--bogus"]))
+
+    @unittest.skipUnless(hasattr(os, "getuid"), "the temp directory is per-user on Windows")
+    def test_foreign_state(self) -> None:
+        self.start()
+        os.chmod(daemon.state_path(), 0o644)
+        self.assertIsNone(daemon.forward(["a.particle"]))
+
+        os.chmod(daemon.state_path(), 0o600)
+        with mock.patch.object(os, "getuid", lambda: os.stat(daemon.state_path()).st_uid + 1):
+            self.assertIsNone(daemon.forward(["a.particle"]))
+
+    def test_environment(self) -> None:
+        seen: List[Optional[str]] = []
+
+        def record(args: argparse.Namespace) -> int:
+            seen.append(os.environ.get("SOURCE_DATE_EPOCH"))
+            return 0
+
+        self.start(run=record)
+        request = daemon._request
+        with mock.patch.dict(os.environ, {"SOURCE_DATE_EPOCH": "1000000000"}):
+            # the daemon's own value must not leak into a client that has none
+            with mock.patch.object(daemon, "_request", lambda *a: {**request(*a), "env": {}}):
+                self.assertEqual(daemon.forward(["a.particle"]), 0)
+            self.assertEqual(daemon.forward(["a.particle"]), 0)
+            self.assertEqual(os.environ["SOURCE_DATE_EPOCH"], "1000000000")
+        self.assertEqual(seen, [None, "1000000000"])
+
+    def test_stale_build(self) -> None:
+        server = self.start()
+        server.build = "0.0.0:0"
+        self.assertIsNone(daemon.forward(["a.particle"]))
+        self.assertTrue(server.stopped)
+
+    def test_idle_timeout(self) -> None:
+        server = daemon.DaemonServer(0.05, parse_args, run)
+        self.addCleanup(server.server_close)
+        server.handle_request()
+        self.assertTrue(server.stopped)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from src import decoders as d
+
+
+class TestDecoders(unittest.TestCase):
+    def test_typed_decoders(self) -> None:
+        self.assertIs(d.EMITTER_DECODERS["Enabled"]("TRUE"), True)
+        self.assertIs(d.AFFECTOR_DECODERS["DoFadeIn"]("FALSE"), False)
+        self.assertEqual(d.EMITTER_DECODERS["RotationDirectionType"]("-1"), -1)
+        self.assertEqual(d.EMITTER_DECODERS["EmitRate"]("20"), 20.0)
+        self.assertEqual(d.EMITTER_DECODERS["MeshName"]('""'), "")
+        self.assertEqual(
+            d.EMITTER_DECODERS["Position"]("[ 0.000000 -1.500000 2.000000 ]"), [0.0, -1.5, 2.0]
+        )
+        self.assertEqual(d.TEXANIM_DECODERS["frameSize"]("[ 64 64 ]"), [64, 64])
+
+    def test_colors_stay_strings(self) -> None:
+        self.assertEqual(d.EMITTER_DECODERS["ParticleStartColor"]("ffc1ff64"), "ffc1ff64")
+        self.assertEqual(d.AFFECTOR_DECODERS["StartColor"]("00000000"), "00000000")
+        with self.assertRaises(ValueError):
+            d.decode_color("notacolor")
+
+    def test_invalid_bool(self) -> None:
+        with self.assertRaises(ValueError):
+            d.decode_bool("__import__('os')")
+
+    def test_fallback(self) -> None:
+        self.assertEqual(d.decode_any("-3"), -3)
+        self.assertEqual(d.decode_any("1.5"), 1.5)
+        self.assertEqual(d.decode_any('"name"'), "name")
+        self.assertEqual(d.decode_any("[ 1, 2.5 ]"), [1, 2.5])
+        self.assertIs(d.decode_any("TRUE"), True)
+        self.assertEqual(d.decode_any("some.value"), "some.value")
+
+
+if __name__ == "__main__":
+    unittest.main()
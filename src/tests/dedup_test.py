@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.dedup import DedupStore
+from src.fileutil import atomic_write
+
+
+class TestDedup(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.out = os.path.join(self.tmp.name, "out")
+        os.makedirs(self.out)
+
+        self.targets = {}
+        for name, data in (("a", "{}"), ("b", "{}"), ("c", '{"x": 1}')):
+            self.targets[name] = os.path.join(self.out, name + ".particle_effect")
+            atomic_write(self.targets[name], data)
+
+    def add_all(self, store: DedupStore) -> None:
+        for target in self.targets.values():
+            store.add(target)
+
+    def test_links_duplicates(self) -> None:
+        store = DedupStore(os.path.join(self.out, ".store"))
+        self.add_all(store)
+
+        a, b, c = self.targets.values()
+        self.assertTrue(os.path.samefile(a, b))
+        self.assertFalse(os.path.samefile(a, c))
+        with open(b) as f:
+            self.assertEqual(f.read(), "{}")
+
+        self.assertEqual(len(store.duplicates()), 1)
+        self.assertEqual(store.saved_bytes, 2)
+        report = store.report(self.out)
+        self.assertEqual((report["files"], report["unique"]), (3, 2))
+        self.assertEqual(
+            report["duplicates"][0]["files"], ["a.particle_effect", "b.particle_effect"]
+        )
+
+    def test_replaced_output_keeps_object(self) -> None:
+        store = DedupStore(os.path.join(self.out, ".store"))
+        self.add_all(store)
+
+        atomic_write(self.targets["a"], "[]")
+        with open(self.targets["b"]) as f:
+            self.assertEqual(f.read(), "{}")
+
+        atomic_write(self.targets["b"], "[]")
+        self.assertEqual(store.prune(), 1)
+        self.assertEqual(DedupStore(store.path).prune(), 0)
+
+    def test_copy(self) -> None:
+        store = DedupStore(os.path.join(self.out, ".store"), copy=True)
+        self.add_all(store)
+
+        self.assertFalse(os.path.samefile(self.targets["a"], self.targets["b"]))
+        self.assertEqual(store.linked, 0)
+        self.assertFalse(os.path.exists(store.path))
+        self.assertEqual(store.prune(), 0)
+
+        path = os.path.join(self.tmp.name, "duplicates.json")
+        store.save_report(path, self.out)
+        with open(path) as f:
+            self.assertEqual(json.load(f)["saved_bytes"], 2)
+
+    def test_copy_prunes_linked_store(self) -> None:
+        path = os.path.join(self.out, ".store")
+        self.add_all(DedupStore(path))
+        for target in self.targets.values():
+            with open(target) as f:
+                data = f.read()
+            atomic_write(target, data)
+
+        # the objects of an earlier hardlinked run go once nothing links to them
+        store = DedupStore(path, copy=True)
+        self.add_all(store)
+        self.assertEqual(store.prune(), 2)
+        self.assertEqual([files for _, _, files in os.walk(path) if files], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
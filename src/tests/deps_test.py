@@ -0,0 +1,138 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from contextlib import redirect_stdout
+from typing import List
+
+from src import batch
+from src.converter import convert_output
+from src.deps import DependencyIndex, references
+
+TEXANIM = (
+    "TXT\n"
+    'textureFileName "ChaosBolt.tga"\n'
+    "numFrames 16\n"
+    "numFramesPerRow 4\n"
+    "startTopLeft [ 0 0 ]\n"
+    "frameSize [ 64 64 ]\n"
+    "frameStride [ 64 64 ]\n"
+)
+
+
+class TestDeps(unittest.TestCase):
+    def setUp(self) -> None:
+        curr_path = os.path.dirname(os.path.abspath(__file__))
+        self.particles_path = os.path.join(curr_path, "particles/")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.source = os.path.join(self.tmp.name, "mod")
+        self.out = os.path.join(self.tmp.name, "out")
+        os.makedirs(os.path.join(self.source, "sub"))
+        self.bolts = [
+            self.copy("Ability_DebrisVacuum-Buff.particle", ""),
+            self.copy("Ability_Fracture_Debuff_Capship.particle", ""),
+        ]
+        self.sparks = self.copy("Ability_DemolitionTeams_Target.particle", "sub")
+        self.plain = self.copy("Ability_AntiModuleTorpedoesImpact.particle", "")
+        self.texanim = os.path.join(self.source, "ChaosBolt.texanim")
+        with open(self.texanim, "w") as f:
+            f.write(TEXANIM)
+
+    def copy(self, name: str, sub: str) -> str:
+        path = os.path.join(self.source, sub, name)
+        shutil.copy(os.path.join(self.particles_path, name), path)
+        return path
+
+    def convert(self, paths: List[str], incremental: bool = False) -> batch.Summary:
+        index = DependencyIndex(os.path.join(self.out, ".deps.json"))
+        with io.StringIO() as buf, redirect_stdout(buf):
+            summary = batch.convert(paths, self.out, index=index, incremental=incremental)
+        index.save()
+        self.index = index
+        return summary
+
+    def converted(self, summary: batch.Summary) -> List[str]:
+        return sorted(os.path.basename(target) for target in summary.outputs)
+
+    def test_references(self) -> None:
+        with open(self.particles_path + "Ability_AntiModuleTorpedoesTravel.particle", "rb") as f:
+            data = f.read()
+        with io.StringIO() as buf, redirect_stdout(buf):
+            output = convert_output("travel.particle", ".particle_effect", data=data)[1]
+        refs = references(output)  # type: ignore
+        self.assertEqual(refs.meshes, ["Weapon_TechCruiserMissile.mesh"])
+        self.assertTrue(all(texture.endswith("_clr") for texture in refs.textures))
+
+    def test_sidecars(self) -> None:
+        summary = self.convert(self.bolts + [self.sparks])
+        self.assertEqual(summary.converted, 4)
+        self.assertEqual(
+            self.converted(summary)[-1], "ChaosBolt.texture_animation", summary.outputs
+        )
+
+        reverse = DependencyIndex(self.index.path).reverse()
+        self.assertEqual(
+            reverse["texture_animations"]["chaosbolt.texture_animation"],
+            [
+                "effects/Ability_DebrisVacuum-Buff.particle_effect",
+                "effects/Ability_Fracture_Debuff_Capship.particle_effect",
+            ],
+        )
+        self.assertEqual(
+            DependencyIndex(self.index.path).dangling(),
+            {
+                "sparks.texture_animation": [
+                    "effects/Ability_DemolitionTeams_Target.particle_effect"
+                ]
+            },
+        )
+
+    def test_incremental(self) -> None:
+        self.assertEqual(self.convert([self.source], incremental=True).converted, 5)
+        summary = self.convert([self.source], incremental=True)
+        self.assertEqual((summary.converted, summary.skipped), (0, 5))
+
+        stat = os.stat(self.texanim)
+        os.utime(self.texanim, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        summary = self.convert([self.source], incremental=True)
+        self.assertEqual(
+            self.converted(summary),
+            [
+                "Ability_DebrisVacuum-Buff.particle_effect",
+                "Ability_Fracture_Debuff_Capship.particle_effect",
+                "ChaosBolt.texture_animation",
+            ],
+        )
+        self.assertEqual(summary.skipped, 2)
+
+        # a sidecar picked up from the index is rebuilt even when only its effect was passed
+        os.utime(self.texanim, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2000))
+        summary = self.convert([self.bolts[0]], incremental=True)
+        self.assertEqual(len(summary.outputs), 2)
+
+        os.remove(
+            os.path.join(self.out, "effects", "sub", os.path.basename(self.sparks) + "_effect")
+        )
+        self.assertEqual(self.convert([self.source], incremental=True).converted, 1)
+
+    def test_prune(self) -> None:
+        archive = os.path.join(self.tmp.name, "mod.zip")
+        with zipfile.ZipFile(archive, "w") as z:
+            z.write(self.plain, "Particle/plain.particle")
+        self.convert([self.plain, archive])
+        self.assertEqual(len(self.index.entries), 2)
+
+        os.remove(self.plain)
+        self.index.prune()
+        self.assertEqual(list(self.index.entries), [f"{archive}/Particle/plain.particle"])
+        os.remove(archive)
+        self.index.prune()
+        self.assertEqual(self.index.entries, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
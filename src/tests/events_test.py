@@ -0,0 +1,58 @@
+import io
+import os
+import unittest
+from itertools import islice
+
+from src.events import EventType, iter_events
+from src.exceptions import SinsParticleFormatException
+
+
+class TestEvents(unittest.TestCase):
+    def setUp(self) -> None:
+        curr_path = os.path.dirname(os.path.abspath(__file__))
+        self.particle_path = os.path.join(curr_path, "particles", "Ability_CombatNanites.particle")
+
+    def test_sources_agree(self) -> None:
+        with open(self.particle_path, "rb") as f:
+            data = f.read()
+        expected = list(iter_events(data))
+
+        self.assertEqual(expected, list(iter_events(self.particle_path)))
+        self.assertEqual(expected, list(iter_events(io.BytesIO(data))))
+        with open(self.particle_path, "r", encoding="utf-8-sig") as f:
+            self.assertEqual(expected, list(iter_events(f)))
+
+    def test_event_stream(self) -> None:
+        events = list(iter_events(self.particle_path))
+        types = [e.type for e in events]
+
+        self.assertEqual(10, types.count(EventType.START_EMITTER))
+        self.assertEqual(10, types.count(EventType.END_EMITTER))
+        self.assertEqual(17, types.count(EventType.START_AFFECTOR))
+        self.assertEqual(17, types.count(EventType.END_AFFECTOR))
+        self.assertEqual(30, types.count(EventType.MATRIX_ROW))
+
+        start = types.index(EventType.START_EMITTER)
+        self.assertEqual(("EmitterType", "Sphere"), (events[start].key, events[start].value))
+        self.assertEqual(("Name", "half1"), (events[start + 1].key, events[start + 1].value))
+        self.assertEqual(("length", 0.0), (events[-1].key, events[-1].value))
+
+    def test_stops_early(self) -> None:
+        with open(self.particle_path, "rb") as f:
+            data = f.read() + b"\tlength 0.000000\n" * 100000
+        stream = io.BytesIO(data)
+        first = list(islice(iter_events(stream), 3))
+        self.assertLess(stream.tell(), len(data) // 10)
+        self.assertEqual(
+            ["HasInfiniteLifeTime", "TotalLifeTime", "NumEmitters"], [e.key for e in first]
+        )
+
+    def test_format_errors(self) -> None:
+        with self.assertRaises(SinsParticleFormatException):
+            list(iter_events(b"TXT2\nParticleSimulation\n\tTotalLifeTime 0.0\n\tlength 0\n\tx 0\n"))
+        with self.assertRaises(SinsParticleFormatException):
+            list(iter_events(b"TXT2\n\tNumEmitters 0\n", texanim=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+
+from src.converter import SinsParticle
+
+
+class TestIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        curr_path = os.path.dirname(os.path.abspath(__file__))
+        self.particles_path = os.path.join(curr_path, "particles/")
+
+    def assertIndexMatches(self, path: str) -> None:
+        with io.StringIO() as buf, redirect_stdout(buf):
+            full = SinsParticle(particle_path=path).parse()
+            lazy = SinsParticle(particle_path=path).scan()
+            index = lazy.index
+            assert index is not None
+
+            simulation = full.collector["ParticleSimulation"]
+            self.assertEqual(simulation["NumEmitters"], index.num_emitters)
+            self.assertEqual(len(simulation["Emitters"]), len(index.emitters))
+            self.assertEqual(len(simulation["Affectors"]), len(index.affectors))
+
+            for i, (entry, emitter) in enumerate(zip(index.emitters, simulation["Emitters"])):
+                self.assertEqual(emitter["EmitterType"], entry.type)
+                self.assertEqual(emitter["EmitterContents"]["Name"], entry.name)
+                self.assertEqual(emitter["EmitterContents"]["MeshName"], entry.mesh)
+                self.assertEqual(
+                    full.file["emitters"][i],  # type: ignore
+                    full.__serialize__(lazy.emitter(i)),
+                )
+
+            modifiers = {m["id"]: m for m in full.file["modifiers"]}  # type: ignore
+            for i, (entry, affector) in enumerate(zip(index.affectors, simulation["Affectors"])):
+                contents = affector["AffectorContents"]
+                self.assertEqual(affector["AffectorType"], entry.type)
+                self.assertEqual(contents.get("AttachedEmitters", []), entry.attached_emitters)
+                if i in modifiers:
+                    self.assertEqual(modifiers[i], full.__serialize__(lazy.modifier(i)))
+
+            self.assertNotIn("ERROR", buf.getvalue())
+
+    def test_scan_matches_parse(self) -> None:
+        for _particle in sorted(os.listdir(self.particles_path))[::7]:
+            with self.subTest(_particle):
+                self.assertIndexMatches(os.path.join(self.particles_path, _particle))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,7 @@ import unittest
 import os
 from contextlib import redirect_stdout
 from typing import Any
-from particle_converter import SinsParticle
+from src.converter import SinsParticle
 
 
 class TestParticle(unittest.TestCase):
@@ -0,0 +1,44 @@
+import unittest
+
+from src import classes as c
+from src import mappings as m
+
+
+class TestMappings(unittest.TestCase):
+    def test_every_type_has_a_converter(self) -> None:
+        self.assertEqual(set(m.EMITTER_CONVERTERS), set(c.EmitterType))
+        sins1 = {
+            c.ModifierType.JITTER,
+            c.ModifierType.SIZE_OSCILLATOR,
+            c.ModifierType.LINEAR_FORCE_IN_DIRECTION,
+            c.ModifierType.ROTATE_ABOUT_AXIS,
+            c.ModifierType.LINEAR_BOUNDED_INFLATE,
+        }
+        self.assertLessEqual(sins1, set(m.MODIFIER_CONVERTERS))
+        self.assertNotIn(c.ModifierType.FADE, m.MODIFIER_CONVERTERS)
+
+    def test_compile_fields(self) -> None:
+        convert = m.compile_fields(
+            {
+                "radius": m.uniform("Radius"),
+                "point": m.optional("Point", m.vector3("Point")),
+                "width_stop": m.ordered_span("Max", "Min"),
+                "is_random_jitter_shared": m.flag("Shared"),
+            }
+        )
+        modifier = c.Modifier(0, "", c.ModifierType.PUSH)
+        convert(modifier, {"Radius": 2.0, "Max": 5.0, "Min": 1.0, "Shared": False})
+
+        self.assertEqual(modifier.radius, c.Vector2f(2.0, 2.0))
+        self.assertEqual(modifier.width_stop, c.Vector2f(1.0, 5.0))
+        self.assertIsNone(modifier.point)
+        self.assertIsNone(modifier.is_random_jitter_shared)
+
+    def test_missing_key(self) -> None:
+        modifier = c.Modifier(0, "", c.ModifierType.KILL)
+        with self.assertRaises(KeyError):
+            m.MODIFIER_CONVERTERS[c.ModifierType.KILL](modifier, {"Distance": 1.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import math
+import random
+import unittest
+
+from src import orientation as o
+
+
+def rotation(a: float, b: float, c: float) -> list:
+    ca, sa, cb, sb, cc, sc = (
+        math.cos(a),
+        math.sin(a),
+        math.cos(b),
+        math.sin(b),
+        math.cos(c),
+        math.sin(c),
+    )
+    return [
+        [cb * cc, -cb * sc, sb],
+        [sa * sb * cc + ca * sc, -sa * sb * sc + ca * cc, -sa * cb],
+        [-ca * sb * cc + sa * sc, ca * sb * sc + sa * cc, ca * cb],
+    ]
+
+
+def trig(m: list) -> tuple:
+    (m00, m01, m02), (m10, m11, m12), (_, _, m22) = m
+    if abs(m02) < 1.0:
+        return math.asin(m02), math.atan2(-m12, m22), math.atan2(-m01, m00)
+    return (math.pi / 2 if m02 >= 1.0 else -math.pi / 2), 0, math.atan2(m10, m11)
+
+
+class TestOrientation(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = random.Random(7)
+        self.matrices = [rotation(*(rng.uniform(-3, 3) for _ in range(3))) for _ in range(200)]
+        self.matrices += [
+            [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+            [[1.0, -0.0, -0.0], [0.0, 1.0, -0.0], [0.0, 0.0, 1.0]],
+            [[0.0, 0.0, 1.0], [0.0, 1.0, 0.0], [-1.0, 0.0, 0.0]],
+            [[0.0, 0.0, -1.0], [0.6, 0.8, 0.0], [1.0, 0.0, 0.0]],
+            rotation(0.3, math.pi / 2, 0.2),
+        ]
+
+    def test_identity_shortcut_is_exact(self) -> None:
+        for m in self.matrices[-5:-3]:
+            result, expected = o.euler(m), trig(m)
+            self.assertEqual(result, expected)
+            self.assertEqual(
+                [math.copysign(1, v) for v in result], [math.copysign(1, v) for v in expected]
+            )
+
+    def test_scalar(self) -> None:
+        for m in self.matrices:
+            self.assertEqual(o.euler(m), trig(m))
+
+    def test_array_matches_scalar(self) -> None:
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest("NumPy is not installed")
+
+        batched = o.euler_array(np.array(self.matrices))
+        for m, result in zip(self.matrices, batched.tolist()):
+            for a, b in zip(result, o.euler(m)):
+                self.assertAlmostEqual(a, b, delta=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from typing import Optional
+
+from src import batch, profiling
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self) -> None:
+        curr_path = os.path.dirname(os.path.abspath(__file__))
+        self.particles_path = os.path.join(curr_path, "particles/")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.names = ["Ability_AntiModuleTorpedoesImpact.particle", "simple.particle"]
+        self.paths = [os.path.join(self.particles_path, name) for name in self.names]
+
+    def convert(self, profiler: Optional[profiling.Profiler]) -> batch.Summary:
+        with io.StringIO() as buf, redirect_stdout(buf):
+            return batch.convert(self.paths, self.tmp.name, profiler=profiler)
+
+    def test_disabled_span_is_shared_noop(self) -> None:
+        self.assertIs(profiling.span("parse"), profiling.span("build"))
+        self.assertEqual(self.convert(None).profiles, [])
+
+    def test_phases(self) -> None:
+        summary = self.convert(profiling.Profiler())
+        self.assertEqual([p.source for p in summary.profiles], self.paths)
+
+        for profile in summary.profiles:
+            self.assertEqual(set(profile.phases), {"read", "parse", "build", "serialize", "save"})
+            self.assertGreaterEqual(
+                profile.seconds, sum(phase.seconds for phase in profile.phases.values())
+            )
+            self.assertTrue(all(phase.peak_bytes > 0 for phase in profile.phases.values()))
+            self.assertEqual(profile.stacks, {})
+        self.assertIsNone(profiling._active)
+
+    def test_report(self) -> None:
+        summary = self.convert(profiling.Profiler(memory=False, stacks=True))
+        report = profiling.report(summary.profiles)
+
+        path = os.path.join(self.tmp.name, "profile.json")
+        report.save(path, top=1)
+        with open(path) as f:
+            data = json.load(f)
+        self.assertEqual(data["files"], 2)
+        self.assertEqual(len(data["slowest"]), 1)
+        self.assertEqual(data["slowest"][0]["source"], report.slowest(1)[0].source)
+        self.assertEqual(data["phases"]["parse"]["peak_bytes"], 0)
+
+        stacks = os.path.join(self.tmp.name, "stacks.txt")
+        report.save_stacks(stacks)
+        with open(stacks) as f:
+            lines = f.read().splitlines()
+        self.assertTrue(any(":_collect:" in line for line in lines))
+        for line in lines:
+            stack, weight = line.rsplit(" ", 1)
+            self.assertGreater(int(weight), 0)
+            self.assertTrue(stack.startswith("batch.py:_convert:"))
+
+
+if __name__ == "__main__":
+    unittest.main()
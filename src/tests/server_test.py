@@ -0,0 +1,137 @@
+import http.client
+import io
+import os
+import socket
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from contextlib import redirect_stdout
+from typing import Tuple
+
+from src.converter import SinsParticle
+from src.server import ConversionServer, ConversionService, ResultCache
+
+
+class TestServer(unittest.TestCase):
+    service: ConversionService
+    server: ConversionServer
+    url: str
+    thread: threading.Thread
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.service = ConversionService(workers=1, timeout=30)
+        cls.server = ConversionServer(0, cls.service)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.service.close()
+
+    def setUp(self) -> None:
+        curr_path = os.path.dirname(os.path.abspath(__file__))
+        self.particles_path = os.path.join(curr_path, "particles/")
+        self.path = os.path.join(self.particles_path, "Ability_AntiModuleTorpedoesImpact.particle")
+        with open(self.path, "rb") as f:
+            self.data = f.read()
+
+    def request(self, path: str, data: bytes = None) -> Tuple[int, bytes, str]:  # type: ignore
+        try:
+            with urllib.request.urlopen(self.url + path, data, timeout=30) as response:
+                return response.status, response.read(), response.headers.get("X-Cache", "")
+        except urllib.error.HTTPError as e:
+            return e.code, e.read(), e.headers.get("X-Cache", "")
+
+    def test_convert(self) -> None:
+        with io.StringIO() as buf, redirect_stdout(buf):
+            expected = SinsParticle(self.path).parse().dumps(compact=True)
+
+        first = self.request("/convert?compact=1", self.data)
+        self.assertEqual(first, (200, expected.encode("utf-8"), "miss"))
+        self.assertEqual(self.request("/convert?compact=1", self.data)[2], "hit")
+        self.assertEqual(self.request("/convert", self.data)[2], "miss")
+
+        metrics = self.request("/metrics")[1].decode("utf-8")
+        self.assertIn('particle_converter_requests_total{path="/convert",status="200"}', metrics)
+        self.assertIn("particle_converter_convert_seconds_count", metrics)
+        self.assertIn("particle_converter_cache_hit_ratio", metrics)
+
+    def test_errors(self) -> None:
+        status, body, _ = self.request("/convert", b"TXT2\nbroken\n")
+        self.assertEqual(status, 422)
+        self.assertIn(b"[ERROR]", body)
+        self.assertNotIn(b"\x1b", body)
+
+        self.assertEqual(self.request("/convert?format=mesh", self.data)[0], 400)
+        self.assertEqual(self.request("/missing")[0], 404)
+        self.assertEqual(self.request("/health"), (200, b"ok\n", ""))
+
+        metrics = self.request("/metrics")[1].decode("utf-8")
+        self.assertIn('path="other",status="404"', metrics)
+
+    def test_content_length(self) -> None:
+        for length, status in ((None, 411), ("abc", 400), ("-1", 400)):
+            connection = http.client.HTTPConnection("127.0.0.1", self.server.server_address[1])
+            self.addCleanup(connection.close)
+            connection.putrequest("POST", "/convert")
+            if length is not None:
+                connection.putheader("Content-Length", length)
+            connection.endheaders()
+            self.assertEqual(connection.getresponse().status, status, length)
+
+    def test_unread_body(self) -> None:
+        # the body is never read on these paths, so it must not be served as a second request
+        body = b"GET /health HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n"
+        for path, status in (("/missing", 404), ("/convert?format=bin", 400)):
+            with socket.create_connection(("127.0.0.1", self.server.server_address[1]), 5) as s:
+                s.sendall(
+                    f"POST {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+                )
+                response = b""
+                chunk = s.recv(65536)
+                while chunk:
+                    response += chunk
+                    chunk = s.recv(65536)
+            self.assertTrue(response.startswith(f"HTTP/1.1 {status} ".encode()), path)
+            self.assertEqual(response.count(b"HTTP/1.1 "), 1, path)
+
+    def test_timeout_recycles_workers(self) -> None:
+        service = ConversionService(workers=1, timeout=0.0001)
+        self.addCleanup(service.close)
+        executor = service.executor
+        processes = list(executor._processes.values())  # type: ignore
+
+        self.assertEqual(service.convert(self.data * 50, ".particle", False)[0], 504)
+        self.assertIsNot(service.executor, executor)
+        for process in processes:
+            process.join(5)
+            self.assertFalse(process.is_alive())
+
+        service.timeout = 30
+        self.assertEqual(service.convert(self.data, ".particle", False)[0], 200)
+
+
+class TestResultCache(unittest.TestCase):
+    def test_lru(self) -> None:
+        cache = ResultCache(max_size=10)
+        cache.put("a", b"aaaa")
+        cache.put("b", b"bbbb")
+        self.assertEqual(cache.get("a"), b"aaaa")
+        cache.put("c", b"cccc")
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), b"aaaa")
+        self.assertEqual((cache.size, cache.hits, cache.misses), (8, 2, 1))
+
+        cache.put("d", b"d" * 11)
+        self.assertIsNone(cache.get("d"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from src.converter import SinsParticle, convert_stream
+
+
+class TestStream(unittest.TestCase):
+    def setUp(self) -> None:
+        curr_path = os.path.dirname(os.path.abspath(__file__))
+        self.particles_path = os.path.join(curr_path, "particles/")
+        self.path = os.path.join(self.particles_path, "Ability_AntiModuleTorpedoesImpact.particle")
+        with open(self.path, "rb") as f:
+            self.data = f.read()
+
+    def parse(self, particle: SinsParticle) -> SinsParticle:
+        with io.StringIO() as buf, redirect_stdout(buf):
+            return particle.parse()
+
+    def test_from_bytes_matches_path(self) -> None:
+        expected = self.parse(SinsParticle(self.path))
+        from_bytes = self.parse(SinsParticle.from_bytes(self.data))
+        from_text = self.parse(SinsParticle.from_text(self.data.decode("utf-8-sig")))
+
+        self.assertIsNotNone(expected.file)
+        self.assertEqual(from_bytes.file, expected.file)
+        self.assertEqual(from_text.file, expected.file)
+
+    def test_dumps_matches_save(self) -> None:
+        particle = self.parse(SinsParticle.from_bytes(self.data))
+        with tempfile.TemporaryDirectory() as tmp:
+            for compact in (False, True):
+                path = os.path.join(tmp, "out.particle_effect")
+                particle.save(path, compact)
+                with open(path) as f:
+                    self.assertEqual(particle.dumps(compact), f.read())
+
+        self.assertEqual(SinsParticle.from_bytes(b"").dumps(), "")
+
+    def test_convert_stream(self) -> None:
+        target = io.StringIO()
+        with io.StringIO() as log, redirect_stdout(log):
+            self.assertEqual(convert_stream(io.BytesIO(self.data), target), "converted")
+            self.assertEqual(log.getvalue(), "")
+        self.assertEqual(target.getvalue(), self.parse(SinsParticle(self.path)).dumps())
+
+        target = io.StringIO()
+        with io.StringIO() as err, redirect_stderr(err):
+            self.assertEqual(convert_stream(io.BytesIO(b"TXT2\nbroken\n"), target), "failed")
+            self.assertIn("[ERROR]", err.getvalue())
+        self.assertEqual(target.getvalue(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
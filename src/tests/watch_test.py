@@ -0,0 +1,87 @@
+import asyncio
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from src.watch import Watcher
+
+
+class TestWatch(unittest.TestCase):
+    def setUp(self) -> None:
+        curr_path = os.path.dirname(os.path.abspath(__file__))
+        self.particles_path = os.path.join(curr_path, "particles/")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        self.source = os.path.join(self.tmp.name, "mod")
+        self.out = os.path.join(self.tmp.name, "out")
+        os.makedirs(self.source)
+        self.names = sorted(os.listdir(self.particles_path))[:2]
+
+    def copy(self, name: str, target: str) -> str:
+        path = os.path.join(self.source, target)
+        shutil.copy(os.path.join(self.particles_path, name), path)
+        return path
+
+    def test_debounce(self) -> None:
+        path = self.copy(self.names[0], "effect.particle")
+        watcher = Watcher([self.source], self.out, debounce=1)
+        self.assertEqual(watcher.poll(0), [])
+
+        self.copy(self.names[1], "effect.particle")
+        self.assertEqual(watcher.poll(10), [])
+        self.assertEqual(watcher.poll(10.5), [])
+
+        with open(path, "a") as f:
+            f.write("\n")
+        self.assertEqual(watcher.poll(11), [])
+        self.assertEqual(watcher.poll(11.5), [])
+        self.assertEqual([job.source for job in watcher.poll(12)], [path])
+        self.assertEqual(watcher.poll(20), [])
+
+        os.remove(path)
+        with io.StringIO() as buf, redirect_stdout(buf):
+            self.assertEqual(watcher.poll(21), [])
+        self.assertEqual(watcher.stats, {})
+
+    def test_unsupported_path(self) -> None:
+        readme = os.path.join(self.tmp.name, "readme.txt")
+        with open(readme, "w") as f:
+            f.write("notes")
+        path = self.copy(self.names[0], "effect.particle")
+
+        with io.StringIO() as buf, redirect_stdout(buf):
+            watcher = Watcher([readme, path], self.out, debounce=0)
+            for now in range(3):
+                watcher.poll(now)
+            self.assertEqual(buf.getvalue(), "")
+        self.assertEqual(watcher.paths, [path])
+
+    def test_run(self) -> None:
+        watcher = Watcher([self.source], self.out, interval=0.01, debounce=0)
+        target = os.path.join(self.out, "effects", "effect.particle_effect")
+
+        async def run() -> None:
+            stop = asyncio.Event()
+            task = asyncio.create_task(watcher.run(stop))
+            self.copy(self.names[0], "effect.particle")
+            for _ in range(500):
+                if os.path.exists(target):
+                    break
+                await asyncio.sleep(0.01)
+            stop.set()
+            await task
+
+        with io.StringIO() as buf, redirect_stdout(buf):
+            asyncio.run(run())
+        self.assertTrue(os.path.isfile(target))
+        self.assertEqual(
+            [f for f in os.listdir(os.path.dirname(target))], ["effect.particle_effect"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
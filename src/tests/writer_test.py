@@ -0,0 +1,79 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from typing import Any, Optional
+
+from src.converter import SinsParticle
+from src.writer import write_json
+
+
+class TestWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        curr_path = os.path.dirname(os.path.abspath(__file__))
+        self.particles_path = os.path.join(curr_path, "particles/")
+
+    def assertMatchesJson(self, obj: Any, indent: Optional[int]) -> None:
+        with io.StringIO() as buf:
+            written = write_json(obj, buf, indent)
+            expected = json.dumps(
+                obj, indent=indent, separators=(",", ":") if indent is None else None
+            )
+            self.assertEqual(buf.getvalue(), expected)
+            self.assertEqual(written, len(expected))
+
+    def test_values(self) -> None:
+        obj: Any
+        for obj in (
+            {},
+            [],
+            {"a": [], "b": {}, "c": [{}]},
+            [1, [2.5, -0.0, float("nan"), float("inf")], None, True, False, 'é\n"x"'],
+            {"nested": {"vector": [1.0, 2.0], "mixed": [1, 2.0], "text": "a"}},
+        ):
+            self.assertMatchesJson(obj, 2)
+            self.assertMatchesJson(obj, None)
+
+    def test_corpus(self) -> None:
+        names = sorted(os.listdir(self.particles_path))[::25]
+        with io.StringIO() as buf, redirect_stdout(buf):
+            particles = [SinsParticle(os.path.join(self.particles_path, n)).parse() for n in names]
+
+        for particle in particles:
+            if particle.file:
+                self.assertMatchesJson(particle.file, 2)
+                self.assertMatchesJson(particle.file, None)
+
+    def test_save(self) -> None:
+        path = os.path.join(self.particles_path, sorted(os.listdir(self.particles_path))[0])
+        with io.StringIO() as buf, redirect_stdout(buf):
+            particle = SinsParticle(path).parse()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            pretty, compact = os.path.join(tmp, "pretty"), os.path.join(tmp, "compact")
+            written = particle.save(pretty)
+            particle.save(compact, compact=True)
+            with open(pretty) as a, open(compact) as b:
+                self.assertEqual(json.loads(a.read()), json.load(b))
+            self.assertEqual(os.path.getsize(pretty), written)
+            self.assertLess(os.path.getsize(compact), os.path.getsize(pretty))
+
+            with open(pretty, "rb") as f:
+                expected = f.read()
+            os.utime(pretty, ns=(0, 0))
+            self.assertEqual(particle.save(pretty), 0)
+            self.assertEqual(os.stat(pretty).st_mtime_ns, 0)
+            # a prefix or an extension of the output has to be rewritten all the same
+            for stale in (expected[:-1], expected + b" ", expected[:100] + b"x" + expected[101:]):
+                with open(pretty, "wb") as f:
+                    f.write(stale)
+                self.assertEqual(particle.save(pretty), written)
+                with open(pretty, "rb") as f:
+                    self.assertEqual(f.read(), expected)
+            self.assertEqual(sorted(os.listdir(tmp)), ["compact", "pretty"])
+
+
+if __name__ == "__main__":
+    unittest.main()
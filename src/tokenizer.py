@@ -0,0 +1,35 @@
+from typing import Iterable, Iterator, NamedTuple
+
+
+class Token(NamedTuple):
+    depth: int
+    key: str
+    value: str
+    text: str
+    line_number: int
+
+
+def _indent_depth(line: str, body: str) -> int:
+    indent = len(line) - len(body)
+    if indent == 0:
+        return 0
+    # a tab counts as four columns, same as the game's own writer
+    return (indent + 3 * line.count("\t", 0, indent)) // 4
+
+
+def iter_tokens(lines: Iterable[str], start: int = 1) -> Iterator[Token]:
+    for line_number, line in enumerate(lines, start):
+        body = line.lstrip()
+        if not body:
+            continue
+        depth = _indent_depth(line, body)
+        body = body.rstrip()
+
+        parts = body.split(None, 1)
+        yield Token(
+            depth,
+            parts[0],
+            parts[1] if len(parts) > 1 else "",
+            body,
+            line_number,
+        )
@@ -0,0 +1,124 @@
+import asyncio
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from colorama import Fore
+
+from src import archive
+from src.batch import Job, Result, iter_jobs, run_job
+from src.cache import ConversionCache
+from src.converter import Logger, output_target
+
+Stat = Tuple[int, int]
+
+
+def _stat(path: str) -> Optional[Stat]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class Watcher:
+    def __init__(
+        self,
+        paths: Iterable[str],
+        out_path: str,
+        cache: Optional[ConversionCache] = None,
+        interval: float = 0.5,
+        debounce: float = 0.5,
+        compact: bool = False,
+    ) -> None:
+        # iter_jobs logs a skipped file on every poll, so drop unsupported ones up front
+        self.paths = [
+            path
+            for path in paths
+            if os.path.isdir(path) or archive.is_archive(path) or output_target(path, out_path)
+        ]
+        self.compact = compact
+        self.out_path = out_path
+        self.cache = cache
+        self.interval = interval
+        self.debounce = debounce
+        self.pending: Dict[str, Tuple[Stat, float, Job]] = {}
+        self.stats: Dict[str, Stat] = {job.path: stat for job, stat in self._scan()}
+
+    def _scan(self) -> List[Tuple[Job, Stat]]:
+        scanned = []
+        for job in iter_jobs(self.paths, self.out_path, self.compact):
+            stat = _stat(job.source)
+            if stat is not None:
+                scanned.append((job, stat))
+        return scanned
+
+    def poll(self, now: Optional[float] = None) -> List[Job]:
+        now = time.monotonic() if now is None else now
+        seen = set()
+
+        for job, stat in self._scan():
+            seen.add(job.path)
+            if self.stats.get(job.path) == stat:
+                continue
+            pending = self.pending.get(job.path)
+            if pending is None or pending[0] != stat:
+                self.pending[job.path] = (stat, now, job)
+
+        for source in set(self.stats) - seen:
+            del self.stats[source]
+            self.pending.pop(source, None)
+            Logger.info(f"Removed: {source}", Fore.WHITE)
+
+        ready = []
+        for source, (stat, changed, job) in list(self.pending.items()):
+            if now - changed >= self.debounce:
+                del self.pending[source]
+                self.stats[source] = stat
+                ready.append(job)
+        return ready
+
+    def convert(self, job: Job) -> Result:
+        return run_job(job, self.cache)
+
+    def report(self, result: Result) -> None:
+        color = Fore.RED if result.status == "failed" else Fore.WHITE
+        status = result.status
+        if status != "failed" and not result.written:
+            status = "unchanged"
+        Logger.print(
+            f"{time.strftime('%H:%M:%S')} {os.path.basename(result.job.path)} "
+            f"{Fore.GREEN}→{color} {os.path.relpath(result.job.target, self.out_path)}"
+            f" ({status})",
+            color,
+        )
+        if result.log:
+            print(result.log, end="")
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        loop = asyncio.get_running_loop()
+        stop = stop or asyncio.Event()
+
+        while not stop.is_set():
+            for job in self.poll():
+                self.report(await loop.run_in_executor(None, self.convert, job))
+            try:
+                await asyncio.wait_for(stop.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+def watch(
+    paths: Iterable[str],
+    out_path: str,
+    cache: Optional[ConversionCache] = None,
+    interval: float = 0.5,
+    debounce: float = 0.5,
+    compact: bool = False,
+) -> None:
+    watcher = Watcher(paths, out_path, cache, interval, debounce, compact)
+    Logger.info(f"Watching {len(watcher.stats)} files, press Ctrl+C to stop")
+    try:
+        asyncio.run(watcher.run())
+    except KeyboardInterrupt:
+        pass
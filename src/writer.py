@@ -0,0 +1,119 @@
+import json
+from typing import IO, Any, Dict, List, Optional
+
+_ESCAPE = json.encoder.encode_basestring_ascii  # type: ignore
+_CONSTANTS = {None: "null", True: "true", False: "false"}
+_INFINITY = float("inf")
+
+CHUNK_SIZE = 1 << 16
+
+
+def _float(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value == _INFINITY:
+        return "Infinity"
+    if value == -_INFINITY:
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+def _key(key: Any) -> str:
+    if isinstance(key, str):
+        return _ESCAPE(key)
+    if isinstance(key, float):
+        return '"' + _float(key) + '"'
+    if key is None or key is True or key is False:
+        return '"' + _CONSTANTS[key] + '"'
+    return '"' + int.__repr__(key) + '"'
+
+
+class JsonWriter:
+    def __init__(self, stream: IO[str], indent: Optional[int] = 2) -> None:
+        self.stream = stream
+        self.indent = indent
+        self.step = "" if indent is None else " " * indent
+        self.newline = "" if indent is None else "\n"
+        self.key_separator = ":" if indent is None else ": "
+        self.parts: List[str] = []
+        self.keys: Dict[Any, str] = {}
+        self.written = 0
+
+    def write(self, obj: Any) -> int:
+        if self.indent is None and isinstance(obj, dict):
+            self._write_compact(obj)
+        else:
+            self._encode(obj, self.newline)
+        self.flush()
+        return self.written
+
+    def flush(self) -> None:
+        data = "".join(self.parts)
+        self.parts.clear()
+        self.stream.write(data)
+        self.written += len(data)
+
+    def _write_compact(self, obj: dict) -> None:
+        # the C encoder is only used for one-shot, unindented dumps, so stream the
+        # document one top-level member at a time through it
+        separator = "{"
+        for key, value in obj.items():
+            self.parts.append(separator + _key(key) + ":")
+            self.parts.append(json.dumps(value, separators=(",", ":")))
+            self.flush()
+            separator = ","
+        self.parts.append("}" if obj else "{}")
+
+    def _encode(self, obj: Any, newline: str) -> None:
+        parts = self.parts
+        if isinstance(obj, str):
+            parts.append(_ESCAPE(obj))
+        elif obj is None or obj is True or obj is False:
+            parts.append(_CONSTANTS[obj])
+        elif isinstance(obj, int):
+            parts.append(int.__repr__(obj))
+        elif isinstance(obj, float):
+            parts.append(_float(obj))
+        elif isinstance(obj, dict):
+            if not obj:
+                parts.append("{}")
+                return
+            inner = newline + self.step
+            separator = "{" + inner
+            keys = self.keys
+            for key, value in obj.items():
+                prefix = keys.get(key) if type(key) is str else None
+                if prefix is None:
+                    prefix = keys[key] = _key(key) + self.key_separator
+                kind = type(value)
+                if kind is str:
+                    parts.append(separator + prefix + _ESCAPE(value))
+                elif kind is float:
+                    parts.append(separator + prefix + _float(value))
+                else:
+                    parts.append(separator + prefix)
+                    self._encode(value, inner)
+                separator = "," + inner
+            parts.append(newline + "}")
+        elif isinstance(obj, (list, tuple)):
+            if not obj:
+                parts.append("[]")
+                return
+            inner = newline + self.step
+            if all(type(value) is float for value in obj):
+                parts.append("[" + inner + ("," + inner).join(map(_float, obj)) + newline + "]")
+                return
+            separator = "[" + inner
+            for value in obj:
+                parts.append(separator)
+                self._encode(value, inner)
+                separator = "," + inner
+            parts.append(newline + "]")
+            if len(parts) > CHUNK_SIZE:
+                self.flush()
+        else:
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def write_json(obj: Any, stream: IO[str], indent: Optional[int] = 2) -> int:
+    return JsonWriter(stream, indent).write(obj)